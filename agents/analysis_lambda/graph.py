@@ -4,6 +4,7 @@ LangGraph workflow definition for the analysis sub-agent.
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 from langgraph.graph.state import END, START, StateGraph
@@ -91,6 +92,19 @@ async def _perform_research(
     return state
 
 
+async def _gather_insights(state: AnalysisState, tools: AnalysisTools) -> AnalysisState:
+    """Run transcription, chart review, and research concurrently.
+
+    Each step writes a distinct state key, so they can share the state mapping.
+    """
+    await asyncio.gather(
+        _transcribe_audio(state, tools),
+        _analyze_images(state, tools),
+        _perform_research(state, tools),
+    )
+    return state
+
+
 async def _synthesize_report(
     state: AnalysisState, tools: AnalysisTools
 ) -> AnalysisState:
@@ -135,31 +149,21 @@ def create_analysis_graph(tools: AnalysisTools) -> Any:
     async def collect_assets_node(state: AnalysisState) -> AnalysisState:
         return await _collect_assets(state, tools)
 
-    async def transcribe_audio_node(state: AnalysisState) -> AnalysisState:
-        return await _transcribe_audio(state, tools)
-
-    async def analyze_images_node(state: AnalysisState) -> AnalysisState:
-        return await _analyze_images(state, tools)
-
-    async def perform_research_node(state: AnalysisState) -> AnalysisState:
-        return await _perform_research(state, tools)
+    async def gather_insights_node(state: AnalysisState) -> AnalysisState:
+        return await _gather_insights(state, tools)
 
     async def synthesize_report_node(state: AnalysisState) -> AnalysisState:
         return await _synthesize_report(state, tools)
 
     graph.add_node("load_trades", load_trades_node)
     graph.add_node("collect_assets", collect_assets_node)
-    graph.add_node("transcribe_audio", transcribe_audio_node)
-    graph.add_node("analyze_images", analyze_images_node)
-    graph.add_node("perform_research", perform_research_node)
+    graph.add_node("gather_insights", gather_insights_node)
     graph.add_node("synthesize_report", synthesize_report_node)
 
     graph.add_edge(START, "load_trades")
     graph.add_edge("load_trades", "collect_assets")
-    graph.add_edge("collect_assets", "transcribe_audio")
-    graph.add_edge("transcribe_audio", "analyze_images")
-    graph.add_edge("analyze_images", "perform_research")
-    graph.add_edge("perform_research", "synthesize_report")
+    graph.add_edge("collect_assets", "gather_insights")
+    graph.add_edge("gather_insights", "synthesize_report")
     graph.add_edge("synthesize_report", END)
     return graph.compile()
 
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import base64
+import asyncio
 import json
 import re
 from typing import Any, Dict, List, Optional
@@ -24,11 +24,25 @@ class AnalysisTools:
         drive_client: GoogleDriveClient,
         gemini_client: GeminiClient,
         web_search_client: WebSearchClient | None = None,
+        max_concurrent_downloads: int = 4,
     ) -> None:
         self._sheets = sheets_client
         self._drive = drive_client
         self._gemini = gemini_client
         self._web_search = web_search_client
+        self._max_downloads = max(1, max_concurrent_downloads)
+        self._download_slots: asyncio.Semaphore | None = None
+        self._download_loop: asyncio.AbstractEventLoop | None = None
+
+    def _download_limiter(self) -> asyncio.Semaphore:
+        """Cap Drive downloads shared by the audio and image fan-outs."""
+        # Rebuilt per event loop; the Lambda handler starts a new loop per
+        # invocation and semaphores bind to the loop that first waits on them.
+        loop = asyncio.get_running_loop()
+        if self._download_slots is None or self._download_loop is not loop:
+            self._download_slots = asyncio.Semaphore(self._max_downloads)
+            self._download_loop = loop
+        return self._download_slots
 
     async def read_trading_journal(
         self,
@@ -91,31 +105,40 @@ class AnalysisTools:
         assets: List[Dict[str, Any]],
     ) -> List[Dict[str, Any]]:
         """Transcribe audio files referenced in the journal."""
-        transcripts: List[Dict[str, Any]] = []
-        for asset in assets:
+        return list(
+            await asyncio.gather(
+                *(
+                    self._transcribe_audio_asset(user_id=user_id, asset=asset)
+                    for asset in assets
+                )
+            )
+        )
+
+    async def _transcribe_audio_asset(
+        self, *, user_id: str, asset: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        # Hold the slot until Gemini is done so at most N files sit in memory.
+        async with self._download_limiter():
             raw = await self._drive.download_file_bytes(
                 user_id=user_id, file_id=asset["file_id"]
             )
-            audio_b64 = base64.b64encode(raw).decode("utf-8")
+            # Gemini accepts raw bytes, so skip the base64 round trip.
             transcript = await self._gemini.transcribe_audio(
                 prompt=(
                     "Transcribe the trader's voice note and summarize sentiment "
                     "(positive/negative/neutral). Return JSON with keys transcript, "
                     "sentiment, highlights."
                 ),
-                audio_base64=audio_b64,
+                audio_base64=raw,
                 mime_type=asset.get("mime_type", "audio/mp4"),
             )
-            transcripts.append(
-                {
-                    "file_id": asset["file_id"],
-                    "link": asset.get("link"),
-                    "name": asset.get("name"),
-                    "trade": asset.get("trade"),
-                    "transcript": _ensure_dict(transcript),
-                }
-            )
-        return transcripts
+        return {
+            "file_id": asset["file_id"],
+            "link": asset.get("link"),
+            "name": asset.get("name"),
+            "trade": asset.get("trade"),
+            "transcript": _ensure_dict(transcript),
+        }
 
     async def analyze_trade_images(
         self,
@@ -124,31 +147,38 @@ class AnalysisTools:
         assets: List[Dict[str, Any]],
     ) -> List[Dict[str, Any]]:
         """Analyze screenshots using Gemini Vision."""
-        insights: List[Dict[str, Any]] = []
-        for asset in assets:
+        return list(
+            await asyncio.gather(
+                *(
+                    self._analyze_image_asset(user_id=user_id, asset=asset)
+                    for asset in assets
+                )
+            )
+        )
+
+    async def _analyze_image_asset(
+        self, *, user_id: str, asset: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        async with self._download_limiter():
             raw = await self._drive.download_file_bytes(
                 user_id=user_id, file_id=asset["file_id"]
             )
-            image_b64 = base64.b64encode(raw).decode("utf-8")
             analysis = await self._gemini.vision_insights(
                 prompt=(
-                    "Review the trading chart. Comment on setup quality, entry timing, "
-                    "and risk management. Provide JSON with keys summary, risks, "
-                    "opportunities."
+                    "Review the trading chart. Comment on setup quality, "
+                    "entry timing, and risk management. Provide JSON with keys "
+                    "summary, risks, opportunities."
                 ),
-                image_base64=image_b64,
+                image_base64=raw,
                 mime_type=asset.get("mime_type", "image/png"),
             )
-            insights.append(
-                {
-                    "file_id": asset["file_id"],
-                    "link": asset.get("link"),
-                    "name": asset.get("name"),
-                    "trade": asset.get("trade"),
-                    "analysis": _ensure_dict(analysis),
-                }
-            )
-        return insights
+        return {
+            "file_id": asset["file_id"],
+            "link": asset.get("link"),
+            "name": asset.get("name"),
+            "trade": asset.get("trade"),
+            "analysis": _ensure_dict(analysis),
+        }
 
     async def perform_web_research(self, *, query: str) -> List[Dict[str, Any]]:
         """Call external search provider for supplemental research."""
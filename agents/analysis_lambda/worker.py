@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List
 
 from agents.analysis_lambda.handler import process_job
 from agents.analysis_lambda.models import AnalysisJobPayload
@@ -24,25 +24,31 @@ class AnalysisQueueWorker:
         queue_client: SQLiteQueueClient,
         store: SQLiteStore,
         poll_interval_seconds: float = 1.0,
+        wait_time_seconds: float = 20.0,
+        # Receiving deletes the message, so claim one job at a time: a crash
+        # loses at most that job and idle workers can pick up the rest.
+        max_messages: int = 1,
     ) -> None:
         self._queue = queue_client
         self._store = store
         self._poll_interval = poll_interval_seconds
+        self._wait_time = wait_time_seconds
+        self._max_messages = max_messages
 
     async def run_forever(self) -> None:
         while True:
-            payload = self._dequeue()
-            if payload is None:
-                await asyncio.sleep(self._poll_interval)
-                continue
-
-            await self._process(payload)
-
-    def _dequeue(self) -> Optional[AnalysisJobPayload]:
-        message = self._queue.dequeue_analysis_request()
-        if message is None:
-            return None
-        return message  # already a dict with correct keys
+            # Long-poll in a worker thread so empty queues don't spin the loop.
+            payloads = await asyncio.to_thread(self._receive)
+            for payload in payloads:
+                await self._process(payload)
+
+    def _receive(self) -> List[AnalysisJobPayload]:
+        # Messages are already dicts with the expected keys.
+        return self._queue.receive_analysis_requests(
+            max_messages=self._max_messages,
+            wait_time_seconds=self._wait_time,
+            poll_interval_seconds=self._poll_interval,
+        )
 
     async def _process(self, payload: AnalysisJobPayload) -> None:
         job_id = payload["job_id"]
@@ -77,6 +83,7 @@ async def main(poll_interval_seconds: float = 1.0) -> None:
         queue_client=queue_client,
         store=store,
         poll_interval_seconds=poll_interval_seconds,
+        wait_time_seconds=settings.aws.sqs_wait_time_seconds,
     )
     await worker.run_forever()
 
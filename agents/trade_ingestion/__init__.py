@@ -0,0 +1 @@
+"""Background worker that persists queued trades to Google Drive and Sheets."""
@@ -0,0 +1,129 @@
+"""Local worker that processes queued trade ingestion jobs from SQLite."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from app.clients.local_queue import SQLiteQueueClient
+from app.clients.sqlite_store import SQLiteStore
+from app.core.config import get_settings
+from app.dependencies.clients import (
+    get_queue_client,
+    get_sqlite_store,
+    get_trade_ingestion_service,
+)
+from app.schemas import TradeAttachment, TradeIngestionRequest
+from app.services import TradeIngestionService
+
+logger = logging.getLogger(__name__)
+
+
+class TradeIngestionWorker:
+    """Poll the ingestion queue and upload trades to Drive and Sheets."""
+
+    def __init__(
+        self,
+        queue_client: SQLiteQueueClient,
+        store: SQLiteStore,
+        ingestion_service: TradeIngestionService,
+        poll_interval_seconds: float = 1.0,
+        wait_time_seconds: float = 20.0,
+        # Receiving deletes the message, so claim one job at a time: a crash
+        # loses at most that job and idle workers can pick up the rest.
+        max_messages: int = 1,
+    ) -> None:
+        self._queue = queue_client
+        self._store = store
+        self._service = ingestion_service
+        self._poll_interval = poll_interval_seconds
+        self._wait_time = wait_time_seconds
+        self._max_messages = max_messages
+
+    async def run_forever(self) -> None:
+        while True:
+            payloads = await asyncio.to_thread(self._receive)
+            for payload in payloads:
+                await self.process(payload)
+
+    def _receive(self) -> List[Dict[str, Any]]:
+        return self._queue.receive_ingestion_requests(
+            max_messages=self._max_messages,
+            wait_time_seconds=self._wait_time,
+            poll_interval_seconds=self._poll_interval,
+        )
+
+    async def process(self, payload: Dict[str, Any]) -> None:
+        """Ingest one queued trade and record the outcome on its job record.
+
+        The message is already off the queue, so a payload that no longer
+        validates marks its job failed instead of stopping the worker.
+        """
+        job_id = payload.get("job_id")
+        user_id = payload.get("user_id") or (payload.get("trade") or {}).get(
+            "user_id"
+        )
+        if not job_id or not user_id:
+            logger.error(
+                "Dropping trade ingestion message without a job reference",
+                extra={"job_id": job_id},
+            )
+            return
+        logger.info("Dequeued trade ingestion job", extra={"job_id": job_id})
+
+        record_key = {
+            "partition_key": f"user#{user_id}",
+            "sort_key": f"ingestion#{job_id}",
+        }
+        record = await asyncio.to_thread(self._store.get_item, **record_key) or {
+            "pk": record_key["partition_key"],
+            "sk": record_key["sort_key"],
+        }
+        record["status"] = "in_progress"
+        record["started_at"] = datetime.now(timezone.utc).isoformat()
+        await asyncio.to_thread(self._store.put_item, record)
+
+        try:
+            trade = TradeIngestionRequest.model_validate(payload["trade"])
+            attachments = [
+                TradeAttachment.model_validate(item)
+                for item in payload.get("attachments") or ()
+            ]
+            result = await self._service.ingest_trade(
+                request=trade,
+                sheet_id=payload["sheet_id"],
+                sheet_range=payload.get("sheet_range"),
+                attachments=attachments,
+            )
+        except Exception as exc:
+            logger.exception(
+                "Failed processing trade ingestion job", extra={"job_id": job_id}
+            )
+            record["status"] = "failed"
+            record["error"] = getattr(exc, "detail", None) or str(exc)
+        else:
+            record["status"] = "completed"
+            record["result"] = result.model_dump(mode="json")
+        record["completed_at"] = datetime.now(timezone.utc).isoformat()
+        await asyncio.to_thread(self._store.put_item, record)
+
+
+async def main(poll_interval_seconds: float = 1.0) -> None:
+    settings = get_settings()
+    worker = TradeIngestionWorker(
+        queue_client=get_queue_client(),
+        store=get_sqlite_store(),
+        ingestion_service=get_trade_ingestion_service(),
+        poll_interval_seconds=poll_interval_seconds,
+        wait_time_seconds=settings.aws.sqs_wait_time_seconds,
+    )
+    await worker.run_forever()
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution path
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Trade ingestion worker stopped")
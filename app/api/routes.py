@@ -4,21 +4,27 @@ FastAPI routes for the trading journal agent.
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
 import logging
 import re
-import uuid
+import secrets
+import sys
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from http import HTTPStatus
-from typing import Annotated, Any
+from typing import Annotated, Any, Awaitable, Callable, TypeVar
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse, RedirectResponse
+from pydantic import BaseModel, ValidationError
 
 from app.clients.google_auth import OAuthTokenExchangeError, OAuthTokenNotFoundError
 from app.services.trade_capture import TradeCaptureSession
+from app.services.trade_ingestion import ALLOWED_MIME_PREFIXES, MAX_ATTACHMENT_BYTES
 from app.services.telegram_conversation import (
     GeminiModelError,
     TelegramConversationalAssistant,
@@ -28,6 +34,7 @@ from app.dependencies import (
     get_app_settings,
     get_google_oauth_client,
     get_google_token_service,
+    get_ingestion_queue_service,
     get_oauth_state_encoder,
     get_sqlite_store,
     get_token_cipher_service,
@@ -35,12 +42,14 @@ from app.dependencies import (
     get_trade_extraction_service,
     get_trade_ingestion_service,
     get_telegram_conversation_assistant,
+    get_upload_store,
 )
 from app.schemas import (
     AnalysisRequest,
     OAuthCallbackPayload,
     TelegramUpdate,
     TradeAttachment,
+    TradeIngestionAccepted,
     TradeIngestionRequest,
     TradeIngestionResponse,
     TradeSubmissionRequest,
@@ -50,16 +59,89 @@ from app.schemas import (
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+# Upper bound on job ids accepted by one batched status lookup.
+_MAX_JOB_STATUS_IDS = 100
+_ISO_TIMESTAMP_RE = re.compile(
+    r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:\d{2})?$"
+)
+
 
 _FIELD_PROMPTS = {
-    "ticker": "Which ticker were you trading?",
-    "pnl": "What was the profit or loss on the trade?",
-    "position_type": "Was it a long, short, or another position type?",
-    "entry_timestamp": "When did you enter the position?",
-    "exit_timestamp": "When did you exit the position?",
+    sys.intern(field): prompt
+    for field, prompt in (
+        ("ticker", "Which ticker were you trading?"),
+        ("pnl", "What was the profit or loss on the trade?"),
+        ("position_type", "Was it a long, short, or another position type?"),
+        ("entry_timestamp", "When did you enter the position?"),
+        ("exit_timestamp", "When did you exit the position?"),
+    )
 }
 
 
+M = TypeVar("M", bound=BaseModel)
+
+
+def _json_body(model: type[M]) -> Callable[[Request], Awaitable[M]]:
+    """Dependency parsing the raw body with ``model_validate_json``.
+
+    pydantic-core validates straight from the JSON bytes, skipping the
+    intermediate dict FastAPI would build; large base64 attachments benefit most.
+    """
+
+    async def parse(request: Request) -> M:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [
+                    {**error, "loc": ("body", *error["loc"])}
+                    for error in exc.errors(include_url=False)
+                ]
+            ) from exc
+
+    return parse
+
+
+def _json_body_openapi(model: type[BaseModel]) -> dict[str, Any]:
+    """Describe a ``_json_body`` payload in the OpenAPI schema."""
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def inline(node: Any) -> Any:
+        # Nested models come back as local $defs refs, which do not resolve
+        # from inside the OpenAPI document, so expand them in place.
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if ref is not None:
+                return inline(definitions[ref.rsplit("/", 1)[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(item) for item in node]
+        return node
+
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline(schema)}},
+        }
+    }
+
+
+def _model_response(model: BaseModel, status_code: int) -> Response:
+    """Serialize an already-validated model without a response_model pass.
+
+    Routes returning schema instances declare ``response_model=None`` and list
+    the models under ``responses=`` for the docs; otherwise FastAPI validates
+    the model it was just handed a second time before serializing it.
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
 @router.get("/health", status_code=HTTPStatus.OK)
 async def healthcheck() -> dict:
     """Simple health endpoint for monitoring."""
@@ -84,12 +166,12 @@ async def start_google_oauth_flow(
     """
     Kick off the OAuth flow by generating a state token and authorization URL.
     """
-    nonce = uuid.uuid4().hex
+    nonce = secrets.token_hex(16)
     state_payload = {
         "nonce": nonce,
         "redirect_to": redirect_to,
         "user_id": user_id,
-        "issued_at": datetime.now(timezone.utc).isoformat(),
+        "issued_at": datetime.now(_UTC).isoformat(),
     }
     state = state_encoder.encode(state_payload)
     authorization_url = oauth_client.build_authorization_url(state=state)
@@ -110,8 +192,10 @@ async def handle_google_oauth_callback(
     record_store: Annotated[Any, Depends(get_sqlite_store)],
     settings: Annotated[Any, Depends(get_app_settings)],
     token_cipher: Annotated[Any, Depends(get_token_cipher_service)],
+    token_service: Annotated[Any, Depends(get_google_token_service)],
 ) -> dict:
     """Complete the OAuth exchange, store tokens, and return redirect metadata."""
+    now = datetime.now(_UTC)
     state_data = state_encoder.decode(payload.state)
 
     issued_at_raw = state_data.get("issued_at")
@@ -121,18 +205,25 @@ async def handle_google_oauth_callback(
             detail="Missing issued_at in state token.",
         )
 
+    if not isinstance(issued_at_raw, str) or not _ISO_TIMESTAMP_RE.match(
+        issued_at_raw
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid issued_at in state token.",
+        )
+
     try:
         issued_at = datetime.fromisoformat(issued_at_raw)
-    except ValueError as exc:  # pragma: no cover - defensive
+    except ValueError as exc:  # pragma: no cover - out-of-range components
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail="Invalid issued_at in state token.",
         ) from exc
 
     if issued_at.tzinfo is None:
-        issued_at = issued_at.replace(tzinfo=timezone.utc)
+        issued_at = issued_at.replace(tzinfo=_UTC)
 
-    now = datetime.now(timezone.utc)
     if now - issued_at > timedelta(seconds=settings.oauth.state_ttl_seconds):
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST, detail="OAuth state token has expired."
@@ -157,19 +248,25 @@ async def handle_google_oauth_callback(
             detail="Failed to exchange authorization code.",
         ) from exc
 
-    expires_at = now + timedelta(seconds=expires_in)
+    now_iso = now.isoformat()
+    access_token_encrypted, refresh_token_encrypted = token_cipher.encrypt_many(
+        [access_token, refresh_token]
+    )
     token_record = {
         "pk": f"user#{user_id}",
         "sk": "oauth#google",
         "user_id": user_id,
         "provider": "google",
-        "access_token_encrypted": token_cipher.encrypt(access_token),
-        "refresh_token_encrypted": token_cipher.encrypt(refresh_token),
-        "expires_at": expires_at.isoformat(),
-        "created_at": now.isoformat(),
-        "updated_at": now.isoformat(),
+        "access_token_encrypted": access_token_encrypted,
+        "refresh_token_encrypted": refresh_token_encrypted,
+        # Epoch seconds, so GoogleTokenService compares floats on every call.
+        "expires_at": now.timestamp() + expires_in,
+        "created_at": now_iso,
+        "updated_at": now_iso,
     }
     record_store.put_item(token_record)
+    # Credentials cached from before the reconnect must not outlive it.
+    token_service.invalidate(user_id)
 
     return {
         "status": "connected",
@@ -185,6 +282,7 @@ async def handle_google_oauth_callback_get(
     record_store: Annotated[Any, Depends(get_sqlite_store)],
     settings: Annotated[Any, Depends(get_app_settings)],
     token_cipher: Annotated[Any, Depends(get_token_cipher_service)],
+    token_service: Annotated[Any, Depends(get_google_token_service)],
     state: str = Query(..., description="OAuth state token."),
     code: str = Query(..., description="Authorization code returned by Google."),
     redirect: bool = Query(
@@ -200,6 +298,7 @@ async def handle_google_oauth_callback_get(
         record_store=record_store,
         settings=settings,
         token_cipher=token_cipher,
+        token_service=token_service,
     )
 
     accept_header = request.headers.get("accept", "")
@@ -213,13 +312,22 @@ async def handle_google_oauth_callback_get(
 
 
 @router.post(
-    "/trades", response_model=TradeIngestionResponse, status_code=HTTPStatus.CREATED
+    "/trades",
+    response_model=None,
+    status_code=HTTPStatus.ACCEPTED,
+    responses={
+        HTTPStatus.ACCEPTED: {"model": TradeIngestionAccepted},
+        HTTPStatus.CREATED: {"model": TradeIngestionResponse},
+    },
+    openapi_extra=_json_body_openapi(TradeIngestionRequest),
 )
 async def ingest_trade(
-    payload: TradeIngestionRequest,
+    payload: Annotated[
+        TradeIngestionRequest, Depends(_json_body(TradeIngestionRequest))
+    ],
     service: Annotated[Any, Depends(get_trade_ingestion_service)],
     token_service: Annotated[Any, Depends(get_google_token_service)],
-    capture_store: Annotated[Any, Depends(get_trade_capture_store)],
+    queue_service: Annotated[Any, Depends(get_ingestion_queue_service)],
     sheet_id: str = Query(
         ..., description="Google Sheet identifier for the trading journal."
     ),
@@ -229,8 +337,12 @@ async def ingest_trade(
             "Target range (e.g., 'Journal!A1') where new trades should be appended."
         ),
     ),
-) -> TradeIngestionResponse:
-    """Accept a trade payload and persist it to Google Drive and Sheets."""
+    sync: bool = Query(
+        default=False,
+        description="Ingest inline and return the Drive/Sheets result (slower).",
+    ),
+) -> Response:
+    """Accept a trade payload and queue it for Google Drive and Sheets storage."""
     try:
         await token_service.get_credentials(user_id=payload.user_id)
     except OAuthTokenNotFoundError as exc:
@@ -239,18 +351,106 @@ async def ingest_trade(
             detail="Google account not connected.",
         ) from exc
 
-    return await service.ingest_trade(
-        request=payload, sheet_id=sheet_id, sheet_range=sheet_range
+    if sync:
+        result = await service.ingest_trade(
+            request=payload, sheet_id=sheet_id, sheet_range=sheet_range
+        )
+        return _model_response(result, HTTPStatus.CREATED)
+
+    # Drive uploads and Sheets writes take seconds; the ingestion worker does them.
+    # Inline files are staged first so the queued job carries only tokens.
+    trade, attachments = await service.stage_inline_attachments(payload)
+    job_id = await asyncio.to_thread(
+        queue_service.enqueue_ingestion,
+        request=trade,
+        sheet_id=sheet_id,
+        sheet_range=sheet_range,
+        attachments=attachments,
     )
+    return _model_response(TradeIngestionAccepted(job_id=job_id), HTTPStatus.ACCEPTED)
+
+
+@router.get("/trades/jobs/{job_id}", status_code=HTTPStatus.OK)
+async def get_trade_ingestion_status(
+    job_id: str,
+    record_store: Annotated[Any, Depends(get_sqlite_store)],
+    user_id: str = Query(
+        ..., description="User identifier associated with the job."
+    ),
+) -> dict:
+    """Fetch the status of a queued trade ingestion job."""
+    item = await asyncio.to_thread(
+        record_store.get_item,
+        partition_key=f"user#{user_id}",
+        sort_key=f"ingestion#{job_id}",
+    )
+    if not item:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Job not found.")
+    return item
+
+
+@router.post("/attachments", status_code=HTTPStatus.CREATED)
+async def upload_attachment(
+    request: Request,
+    upload_store: Annotated[Any, Depends(get_upload_store)],
+    user_id: str = Query(
+        ..., description="Application-level identifier for the trader."
+    ),
+) -> dict:
+    """Stage raw attachment bytes and return a token for ``TradeAttachment``.
+
+    The body is the file itself with its MIME type as ``Content-Type``. It is
+    read chunk by chunk so oversized uploads stop at the limit.
+    """
+    mime_type = request.headers.get("content-type", "").split(";", 1)[0].strip()
+    if not mime_type.startswith(ALLOWED_MIME_PREFIXES):
+        raise HTTPException(
+            status_code=HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported attachment MIME type {mime_type or 'missing'}.",
+        )
+
+    too_large = HTTPException(
+        status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Attachment exceeds {MAX_ATTACHMENT_BYTES // (1024 * 1024)}MB limit.",
+    )
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_ATTACHMENT_BYTES:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_ATTACHMENT_BYTES:
+            raise too_large
+    if not body:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail="Attachment body is empty."
+        )
+
+    staged = await asyncio.to_thread(
+        upload_store.put, user_id=user_id, mime_type=mime_type, data=bytes(body)
+    )
+    return {
+        "upload_token": staged.token,
+        "content_sha256": staged.content_sha256,
+        "mime_type": mime_type,
+        "size_bytes": len(body),
+    }
 
 
 @router.post(
     "/trades/submit",
-    response_model=TradeSubmissionResult,
+    response_model=None,
+    status_code=HTTPStatus.ACCEPTED,
+    responses={
+        HTTPStatus.ACCEPTED: {"model": TradeSubmissionResult},
+        HTTPStatus.CREATED: {"model": TradeSubmissionResult},
+    },
+    openapi_extra=_json_body_openapi(TradeSubmissionRequest),
 )
 async def submit_trade(
-    payload: TradeSubmissionRequest,
-    response: Response,
+    payload: Annotated[
+        TradeSubmissionRequest, Depends(_json_body(TradeSubmissionRequest))
+    ],
     extraction_service: Annotated[Any, Depends(get_trade_extraction_service)],
     ingestion_service: Annotated[Any, Depends(get_trade_ingestion_service)],
     token_service: Annotated[Any, Depends(get_google_token_service)],
@@ -264,8 +464,34 @@ async def submit_trade(
             "Target range (e.g., 'Journal!A1') where new trades should be appended."
         ),
     ),
-) -> TradeIngestionResponse:
+) -> Response:
     """Accept a raw user submission, structure it with Gemini, and persist it."""
+    result = await _capture_submission(
+        payload=payload,
+        extraction_service=extraction_service,
+        ingestion_service=ingestion_service,
+        token_service=token_service,
+        capture_store=capture_store,
+        sheet_id=sheet_id,
+        sheet_range=sheet_range,
+    )
+    status_code = (
+        HTTPStatus.CREATED if result.status == "completed" else HTTPStatus.ACCEPTED
+    )
+    return _model_response(result, status_code)
+
+
+async def _capture_submission(
+    *,
+    payload: TradeSubmissionRequest,
+    extraction_service: Any,
+    ingestion_service: Any,
+    token_service: Any,
+    capture_store: Any,
+    sheet_id: str,
+    sheet_range: str | None = None,
+) -> TradeSubmissionResult:
+    """Structure a submission with Gemini and persist it once complete."""
     try:
         await token_service.get_credentials(user_id=payload.user_id)
     except OAuthTokenNotFoundError as exc:
@@ -287,7 +513,7 @@ async def submit_trade(
         quick_updates = _absorb_user_reply(session, payload.content)
         if quick_updates:
             structured_defaults.update(quick_updates)
-            payload = payload.copy(update=quick_updates)
+            payload = payload.model_copy(update=quick_updates)
 
     if session:
         history_lines = list(session.conversation)
@@ -307,7 +533,9 @@ async def submit_trade(
     exit_ts = payload.exit_timestamp or structured_defaults.get("exit_timestamp")
     notes = payload.notes or structured_defaults.get("notes")
 
-    combined_submission = TradeSubmissionRequest(
+    # Every value here comes from an already validated payload or session, and
+    # extraction re-validates the final trade, so skip a second validation pass.
+    combined_submission = TradeSubmissionRequest.model_construct(
         user_id=payload.user_id,
         session_id=payload.session_id,
         content=history_content,
@@ -324,7 +552,7 @@ async def submit_trade(
 
     if extraction.missing_fields:
         if session:
-            updated_session = capture_store.update(
+            updated_session = capture_store.upsert(
                 session.session_id,
                 message=payload.content,
                 structured=extraction.structured,
@@ -353,7 +581,6 @@ async def submit_trade(
             extraction.structured,
         )
 
-        response.status_code = HTTPStatus.ACCEPTED
         return TradeSubmissionResult(
             status="needs_more_info",
             session_id=session_id,
@@ -371,9 +598,8 @@ async def submit_trade(
     )
 
     if session:
-        capture_store.delete(session.session_id)
+        capture_store.finalize(session.session_id)
 
-    response.status_code = HTTPStatus.CREATED
     return TradeSubmissionResult(
         status="completed",
         session_id=session.session_id if session else None,
@@ -398,10 +624,33 @@ async def request_analysis_job(
             detail="Google account not connected.",
         ) from exc
 
-    job_id = queue_service.enqueue_analysis(request=payload)
+    job_id = await asyncio.to_thread(queue_service.enqueue_analysis, request=payload)
     return {"job_id": job_id, "status": "pending"}
 
 
+@router.get("/analysis/jobs", status_code=HTTPStatus.OK)
+async def list_analysis_job_statuses(
+    record_store: Annotated[Any, Depends(get_sqlite_store)],
+    job_ids: Annotated[
+        list[str],
+        Query(
+            alias="job_id",
+            max_length=_MAX_JOB_STATUS_IDS,
+            description="Analysis job identifiers to look up.",
+        ),
+    ],
+    user_id: str = Query(
+        ..., description="User identifier associated with the jobs."
+    ),
+) -> dict:
+    """Fetch the status of several analysis jobs in one batched lookup."""
+    keys = [
+        {"pk": f"user#{user_id}", "sk": f"analysis#{job_id}"} for job_id in job_ids
+    ]
+    items = await asyncio.to_thread(record_store.batch_get_items, keys)
+    return {"jobs": items}
+
+
 @router.get("/analysis/jobs/{job_id}", status_code=HTTPStatus.OK)
 async def get_analysis_job_status(
     job_id: str,
@@ -411,18 +660,25 @@ async def get_analysis_job_status(
     ),
 ) -> dict:
     """Fetch the status of an analysis job from DynamoDB."""
-    item = record_store.get_item(
-        partition_key=f"user#{user_id}", sort_key=f"analysis#{job_id}"
+    # The record store is synchronous; keep polling clients off the event loop.
+    item = await asyncio.to_thread(
+        record_store.get_item,
+        partition_key=f"user#{user_id}",
+        sort_key=f"analysis#{job_id}",
     )
     if not item:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Job not found.")
     return item
 
 
-@router.post("/integrations/telegram/webhook", status_code=HTTPStatus.OK)
+@router.post(
+    "/integrations/telegram/webhook",
+    status_code=HTTPStatus.OK,
+    openapi_extra=_json_body_openapi(TelegramUpdate),
+)
 async def telegram_webhook(
     request: Request,
-    update: TelegramUpdate,
+    update: Annotated[TelegramUpdate, Depends(_json_body(TelegramUpdate))],
     extraction_service: Annotated[Any, Depends(get_trade_extraction_service)],
     ingestion_service: Annotated[Any, Depends(get_trade_ingestion_service)],
     token_service: Annotated[Any, Depends(get_google_token_service)],
@@ -441,7 +697,7 @@ async def telegram_webhook(
     if not message:
         return {"status": "ignored"}
 
-    message_dict = message.dict(exclude_none=True)
+    message_dict = message.model_dump(exclude_none=True)
     chat_id = message.chat.get("id")
     user_id = str(chat_id)
     text = (message.text or getattr(message, "caption", "") or "").strip()
@@ -467,7 +723,7 @@ async def telegram_webhook(
     if text.lower().startswith("/connect"):
         base_url = settings.telegram_connect_base_url
         if base_url:
-            authorize_base = f"{str(base_url).rstrip('/')}/api/auth/google/authorize"
+            authorize_base = _connect_authorize_base(str(base_url))
         else:
             authorize_base = str(request.url_for("start_google_oauth_flow"))
         connect_url = f"{authorize_base}?user_id={user_id}&redirect=1"
@@ -529,7 +785,9 @@ async def telegram_webhook(
             sheet_range=None,
             prompt=prompt,
         )
-        job_id = queue_service.enqueue_analysis(request=analysis_request)
+        job_id = await asyncio.to_thread(
+            queue_service.enqueue_analysis, request=analysis_request
+        )
         return {
             "method": "sendMessage",
             "chat_id": chat_id,
@@ -561,13 +819,12 @@ async def telegram_webhook(
     if active_session:
         inferred_fields = _absorb_user_reply(active_session, assistant_message)
         if inferred_fields:
-            submission = submission.copy(update=inferred_fields)
+            submission = submission.model_copy(update=inferred_fields)
 
     # TODO: lookup sheet configuration per Telegram chat / user mapping.
     try:
-        result = await submit_trade(
+        result = await _capture_submission(
             payload=submission,
-            response=Response(),
             extraction_service=extraction_service,
             ingestion_service=ingestion_service,
             token_service=token_service,
@@ -651,7 +908,9 @@ def _build_follow_up_prompt(
     if not missing_fields:
         return context
 
-    next_field = missing_fields[0]
+    # Field names arrive from JSON-decoded sessions; interning lets the dict
+    # lookup match on identity against the interned keys above.
+    next_field = sys.intern(missing_fields[0])
     primary_question = _FIELD_PROMPTS.get(
         next_field, f"Please share {next_field.replace('_', ' ')}."
     )
@@ -671,6 +930,12 @@ def _build_follow_up_prompt(
 TELEGRAM_API_BASE = "https://api.telegram.org"
 
 
+@lru_cache(maxsize=8)
+def _connect_authorize_base(base_url: str) -> str:
+    """Return the OAuth authorize endpoint for a configured public base URL."""
+    return f"{base_url.rstrip('/')}/api/auth/google/authorize"
+
+
 async def _collect_telegram_attachments(
     message: dict[str, Any], bot_token: str | None
 ) -> tuple[list[TradeAttachment], list[str]]:
@@ -988,7 +1253,7 @@ def _parse_datetime_expression(message_text: str) -> datetime | None:
             hour = 0
         if meridiem == "pm":
             hour += 12
-        now = datetime.now(timezone.utc)
+        now = datetime.now(_UTC)
         return now.replace(hour=hour, minute=minute, second=0, microsecond=0)
 
     return None
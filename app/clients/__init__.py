@@ -1,12 +1,46 @@
-"""Expose constructed client wrappers."""
+"""Expose constructed client wrappers.
+
+Submodules load on first attribute access so importing one light client
+(e.g. ``app.clients.sqlite_store``) does not pull in the Gemini or Google API
+SDKs.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .gemini import GeminiClient
+    from .google_auth import GoogleOAuthClient, OAuthStateEncoder
+    from .google_drive import GoogleDriveClient
+    from .google_sheets import GoogleSheetsClient
+    from .local_queue import SQLiteQueueClient
+    from .sqlite_store import SQLiteStore
+    from .upload_store import SQLiteUploadStore
+    from .web_search import WebSearchClient
+
+_EXPORTS = {
+    "GeminiClient": ".gemini",
+    "GoogleDriveClient": ".google_drive",
+    "GoogleOAuthClient": ".google_auth",
+    "GoogleSheetsClient": ".google_sheets",
+    "OAuthStateEncoder": ".google_auth",
+    "SQLiteQueueClient": ".local_queue",
+    "SQLiteStore": ".sqlite_store",
+    "SQLiteUploadStore": ".upload_store",
+    "WebSearchClient": ".web_search",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-from .gemini import GeminiClient
-from .google_auth import GoogleOAuthClient, OAuthStateEncoder
-from .google_drive import GoogleDriveClient
-from .google_sheets import GoogleSheetsClient
-from .local_queue import SQLiteQueueClient
-from .sqlite_store import SQLiteStore
-from .web_search import WebSearchClient
 
 __all__ = [
     "GeminiClient",
@@ -16,5 +50,6 @@ __all__ = [
     "OAuthStateEncoder",
     "SQLiteQueueClient",
     "SQLiteStore",
+    "SQLiteUploadStore",
     "WebSearchClient",
 ]
@@ -3,13 +3,26 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import copy
+import hashlib
 import logging
+import random
+import threading
+import time
 from textwrap import dedent
-from typing import Any, Callable, Iterable
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
 
 import google.generativeai as genai
-from google.api_core.exceptions import GoogleAPICallError, NotFound
+import orjson
+from cachetools import TTLCache
+from google.api_core.exceptions import (
+    DeadlineExceeded,
+    GoogleAPICallError,
+    InternalServerError,
+    NotFound,
+    ServiceUnavailable,
+    TooManyRequests,
+)
 
 from app.core.config import GeminiSettings
 
@@ -24,13 +37,60 @@ _VISION_FALLBACKS: tuple[str, ...] = (
     "gemini-pro-vision",
 )
 
+# Errors worth retrying; anything else (bad request, auth) fails immediately.
+_RETRYABLE_ERRORS: tuple[type[GoogleAPICallError], ...] = (
+    DeadlineExceeded,
+    InternalServerError,
+    ServiceUnavailable,
+    TooManyRequests,
+)
+_MAX_ATTEMPTS = 3
+_BACKOFF_INITIAL_SECONDS = 0.2
+_BACKOFF_MAX_SECONDS = 2.0
+_CIRCUIT_FAILURE_THRESHOLD = 5
+_CIRCUIT_COOLDOWN_SECONDS = 30.0
+
 logger = logging.getLogger(__name__)
 
+R = TypeVar("R")
+
+# Serialized prompt sections keyed by a digest of their raw input. Repeated
+# analyses over the same journal skip re-truncating and re-encoding each row.
+_SECTION_CACHE: TTLCache[bytes, str] = TTLCache(maxsize=512, ttl=300)
+_SECTION_CACHE_LOCK = threading.Lock()
+
 
 class GeminiModelError(RuntimeError):
     """Raised when Gemini cannot fulfill a request due to configuration issues."""
 
 
+class _CircuitBreaker:
+    """Fail fast after repeated Gemini errors until a cooldown elapses."""
+
+    def __init__(self, threshold: int, cooldown_seconds: float) -> None:
+        self._threshold = threshold
+        self._cooldown_seconds = cooldown_seconds
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return time.monotonic() < self._open_until
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self._threshold:
+                self._open_until = time.monotonic() + self._cooldown_seconds
+                self._failures = 0
+
+
 class GeminiClient:
     """Provide helper methods for reasoning, vision, and research tasks."""
 
@@ -38,20 +98,30 @@ class GeminiClient:
         self._settings = settings
         # Configure the global client once per process.
         genai.configure(api_key=settings.api_key)
+        self._models: dict[str, genai.GenerativeModel] = {}
+        self._limiters: dict[str, asyncio.Semaphore] = {}
+        # Identical concurrent requests share one Gemini call.
+        self._inflight: dict[bytes, asyncio.Future[Any]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._circuit = _CircuitBreaker(
+            _CIRCUIT_FAILURE_THRESHOLD, _CIRCUIT_COOLDOWN_SECONDS
+        )
 
     async def generate_text(self, prompt: str) -> str:
         """Produce a free-form text response using the configured model."""
 
-        def _invoke() -> str:
-            response = self._invoke_with_models(
+        async def _call() -> str:
+            response = await self._invoke_with_models(
                 models=self._text_model_candidates(),
                 env_var="GEMINI_MODEL_NAME",
                 error_prefix="Gemini text generate_content failed",
-                call=lambda model: model.generate_content(prompt, safety_settings=[]),
+                call=lambda model: model.generate_content_async(
+                    prompt, safety_settings=[]
+                ),
             )
             return response.text or ""
 
-        return await asyncio.to_thread(_invoke)
+        return await self._deduplicated(_request_key("generate_text", prompt), _call)
 
     async def generate_trade_analysis(
         self,
@@ -64,42 +134,44 @@ class GeminiClient:
         web_research: list[dict[str, Any]] | None = None,
     ) -> dict[str, Any]:
         """Call Gemini text model to synthesize a holistic trade analysis."""
-
-        def _invoke() -> str:
-            content = _build_analysis_prompt(
-                system_prompt=system_prompt,
-                job_prompt=job_prompt,
-                trades=trades,
-                audio_insights=audio_insights or [],
-                image_insights=image_insights or [],
-                web_research=web_research or [],
-            )
-            response = self._invoke_with_models(
-                models=self._text_model_candidates(),
-                env_var="GEMINI_MODEL_NAME",
-                error_prefix="Gemini generate_content failed",
-                call=lambda model: model.generate_content(content, safety_settings=[]),
-            )
-            return response.text or ""
-
-        raw = await asyncio.to_thread(_invoke)
-        return _parse_json_response(raw)
+        content = _build_analysis_prompt(
+            system_prompt=system_prompt,
+            job_prompt=job_prompt,
+            trades=trades,
+            audio_insights=audio_insights or [],
+            image_insights=image_insights or [],
+            web_research=web_research or [],
+        )
+        response = await self._invoke_with_models(
+            models=self._text_model_candidates(),
+            env_var="GEMINI_MODEL_NAME",
+            error_prefix="Gemini generate_content failed",
+            call=lambda model: model.generate_content_async(
+                content, safety_settings=[]
+            ),
+        )
+        return _parse_json_response(response.text or "")
 
     async def vision_insights(
         self,
         *,
         prompt: str,
-        image_base64: str,
+        image_base64: str | bytes,
         mime_type: str = "image/png",
     ) -> dict[str, Any]:
-        """Generate insights about an image by invoking the Gemini vision model."""
+        """
+        Generate insights about an image by invoking the Gemini vision model.
 
-        def _invoke() -> str:
-            response = self._invoke_with_models(
+        ``image_base64`` may be raw bytes; base64 text is only needed when the
+        image arrived over a JSON ingress path and is already encoded.
+        """
+
+        async def _call() -> dict[str, Any]:
+            response = await self._invoke_with_models(
                 models=self._vision_model_candidates(),
                 env_var="GEMINI_VISION_MODEL_NAME",
                 error_prefix="Gemini vision generate_content failed",
-                call=lambda model: model.generate_content(
+                call=lambda model: model.generate_content_async(
                     [
                         prompt,
                         {
@@ -110,26 +182,26 @@ class GeminiClient:
                     safety_settings=[],
                 ),
             )
-            return response.text or ""
+            return _parse_json_response(response.text or "")
 
-        raw = await asyncio.to_thread(_invoke)
-        return _parse_json_response(raw)
+        key = _request_key("vision_insights", prompt, image_base64, mime_type)
+        return await self._deduplicated(key, _call)
 
     async def transcribe_audio(
         self,
         *,
         prompt: str,
-        audio_base64: str,
+        audio_base64: str | bytes,
         mime_type: str,
     ) -> dict[str, Any]:
-        """Invoke Gemini to transcribe an audio clip."""
+        """Invoke Gemini to transcribe an audio clip (raw bytes or base64 text)."""
 
-        def _invoke() -> str:
-            response = self._invoke_with_models(
+        async def _call() -> dict[str, Any]:
+            response = await self._invoke_with_models(
                 models=self._text_model_candidates(),
                 env_var="GEMINI_MODEL_NAME",
                 error_prefix="Gemini audio generate_content failed",
-                call=lambda model: model.generate_content(
+                call=lambda model: model.generate_content_async(
                     [
                         {
                             "role": "user",
@@ -142,10 +214,10 @@ class GeminiClient:
                     safety_settings=[],
                 ),
             )
-            return response.text or ""
+            return _parse_json_response(response.text or "")
 
-        raw = await asyncio.to_thread(_invoke)
-        return _parse_json_response(raw)
+        key = _request_key("transcribe_audio", prompt, audio_base64, mime_type)
+        return await self._deduplicated(key, _call)
 
     async def extract_trade_details(
         self,
@@ -156,30 +228,30 @@ class GeminiClient:
     ) -> dict[str, Any]:
         """Request structured trade details from a free-form description."""
 
-        attachments_section = json.dumps(attachment_metadata or [])
-        overrides_section = json.dumps(overrides or {})
-
-        def _invoke() -> str:
-            prompt = dedent(
-                (
-                    "You are a trading journal assistant. Analyse the user's "
-                    "description and return JSON with keys: ticker (string), "
-                    "pnl (number), "
-                    "position_type (string), entry_timestamp (ISO8601 string), "
-                    "exit_timestamp (ISO8601 string), notes (string).\n"
-                    "Use attachment metadata when relevant: "
-                    f"{attachments_section}\n"
-                    "Prefer using explicit overrides when provided: "
-                    f"{overrides_section}\n"
-                    "User submission:\n"
-                    f"{content}"
-                )
+        attachments_section = orjson.dumps(attachment_metadata or []).decode("utf-8")
+        overrides_section = orjson.dumps(overrides or {}).decode("utf-8")
+        prompt = dedent(
+            (
+                "You are a trading journal assistant. Analyse the user's "
+                "description and return JSON with keys: ticker (string), "
+                "pnl (number), "
+                "position_type (string), entry_timestamp (ISO8601 string), "
+                "exit_timestamp (ISO8601 string), notes (string).\n"
+                "Use attachment metadata when relevant: "
+                f"{attachments_section}\n"
+                "Prefer using explicit overrides when provided: "
+                f"{overrides_section}\n"
+                "User submission:\n"
+                f"{content}"
             )
-            response = self._invoke_with_models(
+        )
+
+        async def _call() -> dict[str, Any]:
+            response = await self._invoke_with_models(
                 models=self._text_model_candidates(),
                 env_var="GEMINI_MODEL_NAME",
                 error_prefix="Gemini generate_content failed",
-                call=lambda model: model.generate_content(
+                call=lambda model: model.generate_content_async(
                     [
                         {
                             "role": "user",
@@ -189,27 +261,36 @@ class GeminiClient:
                     safety_settings=[],
                 ),
             )
-            return response.text or ""
+            return _parse_json_response(response.text or "")
 
-        raw = await asyncio.to_thread(_invoke)
-        return _parse_json_response(raw)
+        return await self._deduplicated(
+            _request_key("extract_trade_details", prompt), _call
+        )
 
-    def _invoke_with_models(
+    async def _invoke_with_models(
         self,
         *,
         models: Iterable[str],
         env_var: str,
         error_prefix: str,
-        call: Callable[[genai.GenerativeModel], Any],
+        call: Callable[[genai.GenerativeModel], Awaitable[Any]],
     ) -> Any:
         """Try the configured model followed by fallbacks when available."""
 
+        self._bind_loop()
+        if self._circuit.is_open():
+            raise GeminiModelError(
+                f"{error_prefix}: Gemini is temporarily unavailable; "
+                "retry shortly."
+            )
+
         model_sequence = list(models)
         last_not_found: NotFound | None = None
         for index, model_name in enumerate(model_sequence):
-            generative_model = genai.GenerativeModel(model_name)
+            generative_model = self._model(model_name)
             try:
-                return call(generative_model)
+                async with self._limiter(model_name):
+                    result = await self._call_with_retry(call, generative_model)
             except NotFound as exc:  # pragma: no cover - network call
                 last_not_found = exc
                 logger.warning(
@@ -220,7 +301,10 @@ class GeminiClient:
                 )
                 continue
             except GoogleAPICallError as exc:  # pragma: no cover - network call
+                self._circuit.record_failure()
                 raise GeminiModelError(f"{error_prefix}: {exc.message}") from exc
+            self._circuit.record_success()
+            return result
 
         if last_not_found is not None:
             primary = model_sequence[0] if model_sequence else "unknown"
@@ -233,6 +317,103 @@ class GeminiClient:
 
         raise GeminiModelError(f"{error_prefix}: Unknown error invoking Gemini.")
 
+    @staticmethod
+    async def _call_with_retry(
+        call: Callable[[genai.GenerativeModel], Awaitable[Any]],
+        generative_model: genai.GenerativeModel,
+    ) -> Any:
+        """Retry transient Gemini errors with jittered exponential backoff."""
+        attempt = 1
+        while True:
+            try:
+                return await call(generative_model)
+            except _RETRYABLE_ERRORS as exc:  # pragma: no cover - network call
+                if attempt >= _MAX_ATTEMPTS:
+                    raise
+                delay = min(
+                    _BACKOFF_MAX_SECONDS,
+                    _BACKOFF_INITIAL_SECONDS * 2 ** (attempt - 1),
+                )
+                delay += random.uniform(0, delay)
+                logger.warning(
+                    "Gemini call failed with %s (attempt %d/%d); retrying in %.2fs.",
+                    type(exc).__name__,
+                    attempt,
+                    _MAX_ATTEMPTS,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _deduplicated(
+        self, key: bytes, call: Callable[[], Awaitable[R]]
+    ) -> R:
+        """Share one in-flight Gemini call between identical concurrent requests."""
+        loop = self._bind_loop()
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                result = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The leader was cancelled (e.g. its client disconnected), not
+                # this request: run the call again, leading it if nobody has.
+                return await self._deduplicated(key, call)
+            # Followers get their own copy so callers can't mutate shared results.
+            return copy.deepcopy(result)
+
+        future: asyncio.Future[Any] = loop.create_future()
+        self._inflight[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an unawaited future doesn't log a warning.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # Semaphores, futures and the SDK's grpc.aio client all bind to the
+        # running loop; the Lambda handler starts a fresh loop per invocation,
+        # so rebuild them when it changes.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._limiters = {}
+            self._inflight = {}
+            if self._loop is not None:
+                # configure() drops the SDK's cached async client; the model
+                # handles keep a reference to it, so they are rebuilt too.
+                genai.configure(api_key=self._settings.api_key)
+                self._models = {}
+            self._loop = loop
+        return loop
+
+    def _limiter(self, model_name: str) -> asyncio.Semaphore:
+        """Return the semaphore capping in-flight calls for ``model_name``."""
+        self._bind_loop()
+        limiter = self._limiters.get(model_name)
+        if limiter is None:
+            limiter = asyncio.Semaphore(self._settings.max_concurrency)
+            self._limiters[model_name] = limiter
+        return limiter
+
+    def _model(self, name: str) -> genai.GenerativeModel:
+        """Return a cached model handle so its transport is reused across calls."""
+        model = self._models.get(name)
+        if model is None:
+            model = genai.GenerativeModel(name)
+            self._models[name] = model
+        return model
+
     def _text_model_candidates(self) -> list[str]:
         return self._collect_candidates(
             self._settings.model_name,
@@ -264,18 +445,79 @@ class GeminiClient:
         return candidates
 
 
-def _truncate(value: Any, max_len: int = 4000) -> Any:
-    """Best-effort truncate long strings to keep prompt sizes manageable."""
-    if isinstance(value, str) and len(value) > max_len:
-        return value[: max_len - 3] + "..."
-    return value
+_MAX_FIELD_CHARS = 4000
 
 
 def _flatten_dicts(dicts: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
-    flattened = []
-    for item in dicts:
-        flattened.append({key: _truncate(val) for key, val in item.items()})
-    return flattened
+    """Copy each dict, truncating long strings to keep prompt sizes manageable."""
+    max_len = _MAX_FIELD_CHARS
+    cut = max_len - 3
+    # The truncation check is inlined to avoid a function call per value.
+    return [
+        {
+            key: (
+                val[:cut] + "..."
+                if isinstance(val, str) and len(val) > max_len
+                else val
+            )
+            for key, val in item.items()
+        }
+        for item in dicts
+    ]
+
+
+def _request_key(method: str, *parts: Any) -> bytes:
+    """Digest a Gemini request so identical in-flight calls can be shared."""
+    digest = hashlib.blake2b(method.encode("utf-8"), digest_size=16)
+    for part in parts:
+        encoded = part if isinstance(part, bytes) else orjson.dumps(part)
+        # Length-prefix each part so boundaries can't be confused.
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.digest()
+
+
+def _serialize_section(items: list[dict[str, Any]]) -> str:
+    """Return the truncated JSON encoding of ``items``, reusing cached results."""
+    # Sheet rows can carry non-string headers; json.dumps stringified those too.
+    key = hashlib.blake2b(
+        orjson.dumps(items, option=orjson.OPT_NON_STR_KEYS), digest_size=16
+    ).digest()
+    with _SECTION_CACHE_LOCK:
+        cached = _SECTION_CACHE.get(key)
+    if cached is not None:
+        return cached
+    serialized = orjson.dumps(
+        _flatten_dicts(items), option=orjson.OPT_NON_STR_KEYS
+    ).decode("utf-8")
+    with _SECTION_CACHE_LOCK:
+        _SECTION_CACHE[key] = serialized
+    return serialized
+
+
+_ANALYSIS_HEADER_TEMPLATE = (
+    "System Instructions:\n"
+    "{system}\n\n"
+    "User Request:\n"
+    "{job}\n\n"
+    "Incorporate the following data sources to produce a structured coaching "
+    "report. Use bullet points, call out recurring behaviours, and end with "
+    "2-3 prioritized action items.\n"
+)
+_RESPONSE_SCHEMA_SECTION: dict[str, Any] = {
+    "role": "user",
+    "parts": [
+        (
+            "Respond strictly in JSON with the schema: {"
+            '"performance_overview": {"summary": string, '
+            '"key_metrics": [string]}, '
+            '"behavioural_patterns": [string], '
+            '"opportunities": [string], '
+            '"action_plan": [{"title": string, "detail": string}]}. '
+            "Do not include prose outside the JSON object."
+        ),
+    ],
+}
 
 
 def _build_analysis_prompt(
@@ -288,23 +530,13 @@ def _build_analysis_prompt(
     web_research: list[dict[str, Any]],
 ) -> list[str | dict[str, Any]]:
     """Construct a structured prompt for the Gemini model."""
-    header = dedent(
-        (
-            "System Instructions:\n"
-            f"{system_prompt}\n\n"
-            "User Request:\n"
-            f"{job_prompt}\n\n"
-            "Incorporate the following data sources to produce a structured coaching "
-            "report. Use bullet points, call out recurring behaviours, and end with "
-            "2-3 prioritized action items.\n"
-        )
-    )
+    header = _ANALYSIS_HEADER_TEMPLATE.format(system=system_prompt, job=job_prompt)
 
     sections: list[str | dict[str, Any]] = [header]
     sections.append(
         {
             "role": "user",
-            "parts": ["Journal Entries", json.dumps(_flatten_dicts(trades))],
+            "parts": ["Journal Entries", _serialize_section(trades)],
         }
     )
 
@@ -314,7 +546,7 @@ def _build_analysis_prompt(
                 "role": "user",
                 "parts": [
                     "Audio Sentiment",
-                    json.dumps(_flatten_dicts(audio_insights)),
+                    _serialize_section(audio_insights),
                 ],
             }
         )
@@ -324,7 +556,7 @@ def _build_analysis_prompt(
                 "role": "user",
                 "parts": [
                     "Chart Reviews",
-                    json.dumps(_flatten_dicts(image_insights)),
+                    _serialize_section(image_insights),
                 ],
             }
         )
@@ -334,27 +566,12 @@ def _build_analysis_prompt(
                 "role": "user",
                 "parts": [
                     "Research",
-                    json.dumps(_flatten_dicts(web_research)),
+                    _serialize_section(web_research),
                 ],
             }
         )
 
-    sections.append(
-        {
-            "role": "user",
-            "parts": [
-                (
-                    "Respond strictly in JSON with the schema: {"
-                    '"performance_overview": {"summary": string, '
-                    '"key_metrics": [string]}, '
-                    '"behavioural_patterns": [string], '
-                    '"opportunities": [string], '
-                    '"action_plan": [{"title": string, "detail": string}]}. '
-                    "Do not include prose outside the JSON object."
-                ),
-            ],
-        }
-    )
+    sections.append(_RESPONSE_SCHEMA_SECTION)
     return sections
 
 
@@ -363,8 +580,8 @@ def _parse_json_response(payload: str) -> Any:
     if not payload:
         return {}
     try:
-        return json.loads(payload)
-    except json.JSONDecodeError:
+        return orjson.loads(payload)
+    except orjson.JSONDecodeError:
         return {"raw": payload}
 
 
@@ -0,0 +1,30 @@
+"""Shared helpers for googleapiclient-based wrappers."""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import Any
+
+import google_auth_httplib2
+from googleapiclient.discovery import build
+from googleapiclient.http import build_http
+
+
+@cache
+def get_service(api: str, version: str) -> Any:
+    """
+    Build a discovery-backed service once per process.
+
+    Building parses the discovery document and creates the resource tree, which
+    dominates the cost of small calls. The cached service carries a placeholder
+    transport; every request must run with ``authorized_http(credentials)``.
+    """
+    return build(api, version, http=build_http(), cache_discovery=False)
+
+
+def authorized_http(credentials: Any) -> google_auth_httplib2.AuthorizedHttp:
+    """Return a fresh per-call transport; httplib2 objects aren't thread-safe."""
+    return google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+
+
+__all__ = ["authorized_http", "get_service"]
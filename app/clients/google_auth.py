@@ -6,16 +6,18 @@ These helpers manage the user authentication flow and token refresh lifecycle.
 
 from __future__ import annotations
 
-import base64
+import asyncio
 import hmac
-import json
-from hashlib import sha256
 from typing import Any, Dict, Tuple
+from urllib.parse import quote_plus, urlencode
 
 import httpx
+import orjson
+import pybase64
 from fastapi import HTTPException, status
 
 from app.core.config import GoogleSettings, OAuthSettings
+from app.utils.http import close_with_running_loop
 
 
 class OAuthStateEncoder:
@@ -25,24 +27,23 @@ class OAuthStateEncoder:
         self._secret_key = secret_key.encode("utf-8")
 
     def encode(self, payload: Dict[str, Any]) -> str:
-        serialized = json.dumps(payload, separators=(",", ":"), sort_keys=True)
-        signature = hmac.new(
-            self._secret_key, serialized.encode("utf-8"), sha256
-        ).digest()
-        return base64.urlsafe_b64encode(signature + serialized.encode("utf-8")).decode(
-            "utf-8"
-        )
+        # orjson emits compact bytes directly, so the payload is encoded once and
+        # shared by the signature and the token body.
+        serialized = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        # hmac.digest is the one-shot C fast path for HMAC-SHA256.
+        signature = hmac.digest(self._secret_key, serialized, "sha256")
+        return pybase64.urlsafe_b64encode(signature + serialized).decode("ascii")
 
     def decode(self, token: str) -> Dict[str, Any]:
-        decoded = base64.urlsafe_b64decode(token.encode("utf-8"))
+        decoded = pybase64.urlsafe_b64decode(token)
         signature, serialized = decoded[:32], decoded[32:]
-        expected_signature = hmac.new(self._secret_key, serialized, sha256).digest()
+        expected_signature = hmac.digest(self._secret_key, serialized, "sha256")
         if not hmac.compare_digest(signature, expected_signature):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid OAuth state signature.",
             )
-        return json.loads(serialized)
+        return orjson.loads(serialized)
 
 
 class OAuthTokenExchangeError(Exception):
@@ -64,23 +65,35 @@ class GoogleOAuthClient:
     ) -> None:
         self._google = google_settings
         self._oauth = oauth_settings
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        # Everything but the state is static, so build the query prefix up front.
+        self._authorization_prefixes: Dict[str, str] = {
+            "offline": self._build_authorization_prefix("offline")
+        }
 
     def build_authorization_url(self, state: str, access_type: str = "offline") -> str:
         """Construct the Google OAuth consent URL."""
-        from urllib.parse import urlencode
-
-        params = {
-            "client_id": self._google.client_id,
-            "redirect_uri": str(self._google.redirect_uri),
-            "response_type": "code",
-            "scope": " ".join(self._oauth.scopes),
-            "access_type": access_type,
-            "include_granted_scopes": "true",
-            "prompt": "consent",
-            "state": state,
-        }
-        query = urlencode(params)
-        return f"{self.AUTH_BASE_URL}?{query}"
+        prefix = self._authorization_prefixes.get(access_type)
+        if prefix is None:
+            prefix = self._build_authorization_prefix(access_type)
+            self._authorization_prefixes[access_type] = prefix
+        return prefix + quote_plus(state)
+
+    def _build_authorization_prefix(self, access_type: str) -> str:
+        """Return the consent URL up to and including ``state=``."""
+        query = urlencode(
+            {
+                "client_id": self._google.client_id,
+                "redirect_uri": str(self._google.redirect_uri),
+                "response_type": "code",
+                "scope": self._oauth.scope_param,
+                "access_type": access_type,
+                "include_granted_scopes": "true",
+                "prompt": "consent",
+            }
+        )
+        return f"{self.AUTH_BASE_URL}?{query}&state="
 
     async def exchange_authorization_code(self, code: str) -> Tuple[str, str, int]:
         """
@@ -96,8 +109,7 @@ class GoogleOAuthClient:
             "grant_type": "authorization_code",
         }
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(self.TOKEN_URL, data=payload)
+        response = await self._http().post(self.TOKEN_URL, data=payload)
 
         if response.status_code != status.HTTP_200_OK:
             raise OAuthTokenExchangeError(response.text)
@@ -123,8 +135,7 @@ class GoogleOAuthClient:
             "grant_type": "refresh_token",
         }
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(self.TOKEN_URL, data=payload)
+        response = await self._http().post(self.TOKEN_URL, data=payload)
 
         if response.status_code != status.HTTP_200_OK:
             raise OAuthTokenExchangeError(response.text)
@@ -140,6 +151,31 @@ class GoogleOAuthClient:
 
         return access_token, int(expires_in)
 
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client; call on application shutdown."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+    def _http(self) -> httpx.AsyncClient:
+        """Return a keep-alive client so token calls reuse warm connections."""
+        # httpx pools bind to the running loop; the Lambda handler starts a new
+        # loop per invocation, so rebuild the client when the loop changes.
+        loop = asyncio.get_running_loop()
+        if (
+            self._client is None
+            or self._client.is_closed
+            or self._client_loop is not loop
+        ):
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=32),
+            )
+            self._client_loop = loop
+            close_with_running_loop(self._client)
+        return self._client
+
 
 __all__ = [
     "GoogleOAuthClient",
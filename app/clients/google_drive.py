@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 import asyncio
-import base64
 import io
 import time
-from typing import TYPE_CHECKING, Iterable, Optional
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterable, Optional
 
-from googleapiclient.discovery import build
+import pybase64
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
 
+from app.clients.google_api import authorized_http, get_service
+
 if TYPE_CHECKING:  # pragma: no cover - type hints only
     from app.services.google_tokens import GoogleTokenService
 
+# Fewer, larger ranged GETs than the 100 KiB library default.
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 class GoogleDriveClient:
     """Upload trade artifacts to Google Drive."""
@@ -37,13 +41,51 @@ class GoogleDriveClient:
         tags: Optional[Iterable[str]] = None,
     ) -> dict:
         """Upload a base64-encoded file to the user's Drive and return metadata."""
-        file_bytes = base64.b64decode(file_b64)
+        return await self._upload(
+            user_id=user_id,
+            file_name=file_name,
+            payload=file_b64,
+            mime_type=mime_type,
+            tags=tags,
+        )
+
+    async def upload_file_bytes(
+        self,
+        *,
+        user_id: str,
+        file_name: str,
+        file_bytes: bytes,
+        mime_type: str,
+        tags: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """Upload raw file bytes; prefer this when the payload isn't base64 already."""
+        return await self._upload(
+            user_id=user_id,
+            file_name=file_name,
+            payload=file_bytes,
+            mime_type=mime_type,
+            tags=tags,
+        )
+
+    async def _upload(
+        self,
+        *,
+        user_id: str,
+        file_name: str,
+        payload: bytes | str,
+        mime_type: str,
+        tags: Optional[Iterable[str]],
+    ) -> dict:
         credentials = await self._token_service.get_credentials(user_id=user_id)
 
         def _execute_upload() -> dict:
-            service = build(
-                "drive", "v3", credentials=credentials, cache_discovery=False
-            )
+            if isinstance(payload, str):
+                # Decode on the worker thread so large payloads don't block the loop.
+                file_bytes = pybase64.b64decode(payload, validate=False)
+            else:
+                file_bytes = payload
+            service = get_service("drive", "v3")
+            http = authorized_http(credentials)
             file_metadata = {"name": file_name}
             app_properties = {
                 f"tag_{index}": tag for index, tag in enumerate(tags or [], start=1)
@@ -64,7 +106,7 @@ class GoogleDriveClient:
                     media_body=media,
                     fields="id, webViewLink, mimeType",
                 )
-                .execute()
+                .execute(http=http)
             )
 
             shareable_link = created.get("webViewLink")
@@ -84,20 +126,15 @@ class GoogleDriveClient:
         credentials = await self._token_service.get_credentials(user_id=user_id)
 
         def _execute_download() -> bytes:
-            service = build(
-                "drive", "v3", credentials=credentials, cache_discovery=False
-            )
+            service = get_service("drive", "v3")
+            http = authorized_http(credentials)
             attempt = 0
             while attempt < 3:
                 try:
-                    request = service.files().get_media(fileId=file_id)
                     fh = io.BytesIO()
-                    downloader = MediaIoBaseDownload(fh, request)
-                    done = False
-                    while not done:
-                        _, done = downloader.next_chunk()
-                    fh.seek(0)
-                    return fh.read()
+                    self._download_into(service, http, file_id, fh)
+                    # getvalue() avoids the extra full-buffer copy of seek + read.
+                    return fh.getvalue()
                 except HttpError as exc:  # pragma: no cover - network path
                     attempt += 1
                     if attempt >= 3:
@@ -107,18 +144,27 @@ class GoogleDriveClient:
 
         return await asyncio.to_thread(_execute_download)
 
+    @staticmethod
+    def _download_into(service: Any, http: Any, file_id: str, sink: BinaryIO) -> None:
+        request = service.files().get_media(fileId=file_id)
+        # MediaIoBaseDownload issues its chunk requests through request.http.
+        request.http = http
+        downloader = MediaIoBaseDownload(sink, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+        done = False
+        while not done:
+            _, done = downloader.next_chunk()
+
     async def get_file_metadata(self, *, user_id: str, file_id: str) -> dict:
         """Fetch metadata for a Drive file."""
         credentials = await self._token_service.get_credentials(user_id=user_id)
 
         def _execute_metadata() -> dict:
-            service = build(
-                "drive", "v3", credentials=credentials, cache_discovery=False
-            )
+            service = get_service("drive", "v3")
+            http = authorized_http(credentials)
             return (
                 service.files()
                 .get(fileId=file_id, fields="id,name,mimeType,webViewLink")
-                .execute()
+                .execute(http=http)
             )
 
         return await asyncio.to_thread(_execute_metadata)
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+from itertools import zip_longest
 from typing import TYPE_CHECKING, Any, Dict, List
 
-from googleapiclient.discovery import build
+from app.clients.google_api import authorized_http, get_service
 
 if TYPE_CHECKING:  # pragma: no cover - type hints only
     from app.services.google_tokens import GoogleTokenService
@@ -29,9 +30,7 @@ class GoogleSheetsClient:
         credentials = await self._token_service.get_credentials(user_id=user_id)
 
         def _execute_append() -> str:
-            service = build(
-                "sheets", "v4", credentials=credentials, cache_discovery=False
-            )
+            service = get_service("sheets", "v4")
             result = (
                 service.spreadsheets()
                 .values()
@@ -42,7 +41,7 @@ class GoogleSheetsClient:
                     insertDataOption="INSERT_ROWS",
                     body={"values": [row]},
                 )
-                .execute()
+                .execute(http=authorized_http(credentials))
             )
             updates = result.get("updates", {})
             return updates.get("updatedRange") or updates.get("tableRange") or ""
@@ -60,9 +59,7 @@ class GoogleSheetsClient:
         credentials = await self._token_service.get_credentials(user_id=user_id)
 
         def _execute_fetch() -> List[Dict[str, Any]]:
-            service = build(
-                "sheets", "v4", credentials=credentials, cache_discovery=False
-            )
+            service = get_service("sheets", "v4")
             response = (
                 service.spreadsheets()
                 .values()
@@ -72,27 +69,32 @@ class GoogleSheetsClient:
                     valueRenderOption="UNFORMATTED_VALUE",
                     majorDimension="ROWS",
                 )
-                .execute()
+                .execute(http=authorized_http(credentials))
             )
             values = response.get("values", [])
             if not values:
                 return []
 
-            headers = values[0]
-            rows = []
-            for row_values in values[1:]:
-                row_dict: Dict[str, Any] = {}
-                for index, header in enumerate(headers):
-                    if not header:
-                        continue
-                    if index < len(row_values):
-                        row_dict[header] = row_values[index]
-                    else:
-                        row_dict[header] = None
-                rows.append(row_dict)
-            return rows
+            return _rows_to_dicts(values[0], values[1:])
 
         return await asyncio.to_thread(_execute_fetch)
 
 
+def _rows_to_dicts(
+    headers: List[Any], rows: List[List[Any]]
+) -> List[Dict[str, Any]]:
+    """Map each row onto the non-empty headers, padding short rows with None."""
+    if all(headers):
+        # Cells past the header width are dropped; short rows pad with None.
+        return [dict(zip_longest(headers, row[: len(headers)])) for row in rows]
+
+    keep = [index for index, header in enumerate(headers) if header]
+    names = [headers[index] for index in keep]
+    width = len(headers)
+    return [
+        dict(zip(names, [padded[index] for index in keep], strict=True))
+        for padded in (row + [None] * (width - len(row)) for row in rows)
+    ]
+
+
 __all__ = ["GoogleSheetsClient"]
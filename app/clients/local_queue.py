@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
-import json
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator
+
+import orjson
+
+from app.clients.sqlite_store import connect_wal
+
+_ANALYSIS_QUEUE = "analysis_job_queue"
+_INGESTION_QUEUE = "trade_ingestion_queue"
+_QUEUE_TABLES = (_ANALYSIS_QUEUE, _INGESTION_QUEUE)
 
 
 class SQLiteQueueClient:
@@ -16,46 +26,129 @@ class SQLiteQueueClient:
         self._db_path = Path(db_path)
         if self._db_path.parent and not self._db_path.parent.exists():
             self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = connect_wal(self._db_path)
+        self._lock = threading.Lock()
         self._ensure_schema()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Serialize access to the shared connection inside one transaction."""
+        with self._lock, self._conn:
+            yield self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
 
     def _ensure_schema(self) -> None:
         with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS analysis_job_queue (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    payload TEXT NOT NULL,
-                    created_at TEXT NOT NULL
+            for table in _QUEUE_TABLES:
+                conn.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        payload TEXT NOT NULL,
+                        created_at TEXT NOT NULL
+                    )
+                    """
                 )
-                """
-            )
+
+    def ping(self) -> None:
+        """Open a connection and run a trivial query to warm the database."""
+        with self._connect() as conn:
+            conn.execute("SELECT 1").fetchone()
 
     def enqueue_analysis_request(self, payload: Dict[str, Any]) -> None:
-        message_json = json.dumps(payload)
+        self.enqueue_analysis_requests([payload])
+
+    def enqueue_analysis_requests(self, payloads: Iterable[Dict[str, Any]]) -> None:
+        """Insert several job payloads in a single transaction."""
+        self._enqueue(_ANALYSIS_QUEUE, payloads)
+
+    def enqueue_ingestion_request(self, payload: Dict[str, Any]) -> None:
+        """Queue a trade ingestion payload for the background worker."""
+        self._enqueue(_INGESTION_QUEUE, [payload])
+
+    def receive_analysis_requests(
+        self,
+        *,
+        max_messages: int = 10,
+        wait_time_seconds: float = 20.0,
+        poll_interval_seconds: float = 0.25,
+    ) -> list[Dict[str, Any]]:
+        """
+        Pop up to ``max_messages`` payloads, waiting for work like SQS long polling.
+
+        Returns as soon as at least one message is available, or an empty list once
+        ``wait_time_seconds`` elapse without any work arriving.
+        """
+        return self._receive(
+            _ANALYSIS_QUEUE, max_messages, wait_time_seconds, poll_interval_seconds
+        )
+
+    def receive_ingestion_requests(
+        self,
+        *,
+        max_messages: int = 10,
+        wait_time_seconds: float = 20.0,
+        poll_interval_seconds: float = 0.25,
+    ) -> list[Dict[str, Any]]:
+        """Long-poll the trade ingestion queue; see ``receive_analysis_requests``."""
+        return self._receive(
+            _INGESTION_QUEUE, max_messages, wait_time_seconds, poll_interval_seconds
+        )
+
+    def _enqueue(self, table: str, payloads: Iterable[Dict[str, Any]]) -> None:
         created_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (orjson.dumps(payload).decode("utf-8"), created_at)
+            for payload in payloads
+        ]
+        if not rows:
+            return
         with self._connect() as conn:
-            conn.execute(
-                "INSERT INTO analysis_job_queue (payload, created_at) VALUES (?, ?)",
-                (message_json, created_at),
+            conn.executemany(
+                f"INSERT INTO {table} (payload, created_at) VALUES (?, ?)",
+                rows,
             )
 
+    def _receive(
+        self,
+        table: str,
+        max_messages: int,
+        wait_time_seconds: float,
+        poll_interval_seconds: float,
+    ) -> list[Dict[str, Any]]:
+        deadline = time.monotonic() + wait_time_seconds
+        while True:
+            messages = self._pop_batch(table, max_messages)
+            if messages or time.monotonic() >= deadline:
+                return messages
+            time.sleep(poll_interval_seconds)
+
+    def _pop_batch(self, table: str, max_messages: int) -> list[Dict[str, Any]]:
+        # DELETE ... RETURNING (SQLite 3.35+) claims and reads in one statement.
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"DELETE FROM {table} WHERE id IN "
+                f"(SELECT id FROM {table} ORDER BY id LIMIT ?) "
+                "RETURNING id, payload",
+                (max_messages,),
+            ).fetchall()
+        # RETURNING order is unspecified; restore FIFO order.
+        rows.sort(key=lambda row: row["id"])
+        return [orjson.loads(row["payload"]) for row in rows]
+
     def dequeue_analysis_request(self) -> Dict[str, Any] | None:
         with self._connect() as conn:
             row = conn.execute(
-                "SELECT id, payload FROM analysis_job_queue ORDER BY id LIMIT 1"
+                "DELETE FROM analysis_job_queue WHERE id = "
+                "(SELECT id FROM analysis_job_queue ORDER BY id LIMIT 1) "
+                "RETURNING payload"
             ).fetchone()
-            if not row:
-                return None
-            conn.execute(
-                "DELETE FROM analysis_job_queue WHERE id = ?",
-                (row["id"],),
-            )
-        return json.loads(row["payload"])
+        if not row:
+            return None
+        return orjson.loads(row["payload"])
 
 
 __all__ = ["SQLiteQueueClient"]
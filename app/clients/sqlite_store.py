@@ -2,25 +2,63 @@
 
 from __future__ import annotations
 
-import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import orjson
+from cachetools import TTLCache
+
+BATCH_GET_LIMIT = 100
+# Highest code point; its UTF-8 encoding sorts after any other continuation.
+_MAX_CHAR = "\U0010ffff"
+
+
+def connect_wal(db_path: Path) -> sqlite3.Connection:
+    """Open a long-lived connection tuned for many small reads and writes."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    # WAL lets readers proceed during writes; NORMAL skips the fsync per commit.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
 
 
 class SQLiteStore:
     """Simple key-value store using a normalized table keyed by (pk, sk)."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        cache_ttl_seconds: float = 2.0,
+        cache_maxsize: int = 10_000,
+    ) -> None:
         self._db_path = Path(db_path)
         if self._db_path.parent and not self._db_path.parent.exists():
             self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Short-lived read cache so status pollers don't each hit the database.
+        self._item_cache: TTLCache[Tuple[str, str], str] = TTLCache(
+            maxsize=cache_maxsize, ttl=cache_ttl_seconds
+        )
+        self._item_cache_lock = threading.Lock()
+        self._conn = connect_wal(self._db_path)
+        self._lock = threading.Lock()
         self._ensure_schema()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Serialize access to the shared connection inside one transaction."""
+        with self._lock, self._conn:
+            yield self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
 
     def _ensure_schema(self) -> None:
         with self._connect() as conn:
@@ -35,34 +73,102 @@ class SQLiteStore:
                 """
             )
 
+    def ping(self) -> None:
+        """Open a connection and run a trivial query to warm the database."""
+        with self._connect() as conn:
+            conn.execute("SELECT 1").fetchone()
+
     def put_item(self, item: Dict[str, Any]) -> None:
-        pk = item.get("pk")
-        sk = item.get("sk")
-        if not pk or not sk:
-            raise ValueError("Item must include 'pk' and 'sk' keys")
+        self.put_items([item])
+
+    def put_items(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Upsert several items in a single transaction."""
+        rows = []
+        for item in items:
+            pk = item.get("pk")
+            sk = item.get("sk")
+            if not pk or not sk:
+                raise ValueError("Item must include 'pk' and 'sk' keys")
+            # Stored as TEXT so rows written by older releases stay readable.
+            data_json = orjson.dumps(item, option=orjson.OPT_NON_STR_KEYS).decode()
+            rows.append((pk, sk, data_json))
+        if not rows:
+            return
 
-        data_json = json.dumps(item)
         with self._connect() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO kv_records (pk, sk, data)
                 VALUES (?, ?, ?)
                 ON CONFLICT(pk, sk) DO UPDATE SET data = excluded.data
                 """,
-                (pk, sk, data_json),
+                rows,
             )
+        for pk, sk, _ in rows:
+            self._invalidate(pk, sk)
 
     def get_item(
         self, *, partition_key: str, sort_key: str
     ) -> Optional[Dict[str, Any]]:
+        key = (partition_key, sort_key)
+        with self._item_cache_lock:
+            cached = self._item_cache.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+
         with self._connect() as conn:
             row = conn.execute(
                 "SELECT data FROM kv_records WHERE pk = ? AND sk = ?",
-                (partition_key, sort_key),
+                key,
             ).fetchone()
-        if not row:
-            return None
-        return json.loads(row["data"])
+            if not row:
+                return None
+            data_json = row["data"]
+            # Fill while still holding the connection so a concurrent write
+            # cannot commit and invalidate before this (older) value lands.
+            with self._item_cache_lock:
+                self._item_cache[key] = data_json
+        return orjson.loads(data_json)
+
+    def batch_get_items(self, keys: list[Dict[str, str]]) -> list[Dict[str, Any]]:
+        """Fetch many ``{"pk", "sk"}`` keys, returning found items in key order."""
+        found: Dict[Tuple[str, str], str] = {}
+        pending: list[Tuple[str, str]] = []
+        with self._item_cache_lock:
+            for key in keys:
+                pair = (key["pk"], key["sk"])
+                cached = self._item_cache.get(pair)
+                if cached is not None:
+                    found[pair] = cached
+                else:
+                    pending.append(pair)
+
+        pending = list(dict.fromkeys(pending))
+        if pending:
+            with self._connect() as conn:
+                for start in range(0, len(pending), BATCH_GET_LIMIT):
+                    chunk = pending[start : start + BATCH_GET_LIMIT]
+                    placeholders = ", ".join("(?, ?)" for _ in chunk)
+                    params = [value for pair in chunk for value in pair]
+                    rows = conn.execute(
+                        "SELECT pk, sk, data FROM kv_records "
+                        f"WHERE (pk, sk) IN (VALUES {placeholders})",
+                        params,
+                    ).fetchall()
+                    for row in rows:
+                        found[(row["pk"], row["sk"])] = row["data"]
+                # As in get_item, fill before a concurrent write can invalidate.
+                with self._item_cache_lock:
+                    for pair in pending:
+                        if pair in found:
+                            self._item_cache[pair] = found[pair]
+
+        items: list[Dict[str, Any]] = []
+        for key in keys:
+            data_json = found.get((key["pk"], key["sk"]))
+            if data_json is not None:
+                items.append(orjson.loads(data_json))
+        return items
 
     def delete_item(self, *, partition_key: str, sort_key: str) -> None:
         with self._connect() as conn:
@@ -70,16 +176,23 @@ class SQLiteStore:
                 "DELETE FROM kv_records WHERE pk = ? AND sk = ?",
                 (partition_key, sort_key),
             )
+        self._invalidate(partition_key, sort_key)
+
+    def _invalidate(self, partition_key: str, sort_key: str) -> None:
+        with self._item_cache_lock:
+            self._item_cache.pop((partition_key, sort_key), None)
 
     def list_items_with_prefix(
         self, *, partition_key: str, sort_key_prefix: str
     ) -> list[Dict[str, Any]]:
         with self._connect() as conn:
+            # An explicit range is always an index range scan on the primary key,
+            # unlike LIKE (which is also case-insensitive and honours wildcards).
             rows = conn.execute(
-                "SELECT data FROM kv_records WHERE pk = ? AND sk LIKE ?",
-                (partition_key, f"{sort_key_prefix}%"),
+                "SELECT data FROM kv_records WHERE pk = ? AND sk >= ? AND sk < ?",
+                (partition_key, sort_key_prefix, sort_key_prefix + _MAX_CHAR),
             ).fetchall()
-        return [json.loads(row["data"]) for row in rows]
+        return [orjson.loads(row["data"]) for row in rows]
 
 
-__all__ = ["SQLiteStore"]
+__all__ = ["SQLiteStore", "connect_wal"]
@@ -0,0 +1,140 @@
+"""SQLite-backed staging area for attachments uploaded ahead of a submission.
+
+Stands in for S3 pre-signed uploads: clients send the raw bytes once to
+``POST /api/attachments`` and the JSON submission carries only the returned
+token, so large files never travel as base64 through request validation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from app.clients.sqlite_store import connect_wal
+
+
+@dataclass(frozen=True)
+class StagedUpload:
+    """Attachment bytes waiting to be attached to a trade."""
+
+    token: str
+    user_id: str
+    mime_type: str
+    content_sha256: str
+    data: bytes
+
+
+class SQLiteUploadStore:
+    """Hold uploaded attachment bytes until a submission references them."""
+
+    def __init__(self, db_path: str, *, ttl_seconds: int = 24 * 60 * 60) -> None:
+        self._db_path = Path(db_path)
+        if self._db_path.parent and not self._db_path.parent.exists():
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl_seconds
+        self._conn = connect_wal(self._db_path)
+        self._lock = threading.Lock()
+        # Reads already skip expired rows, so the DELETE only needs to run now
+        # and then to reclaim space.
+        self._prune_interval = max(60, ttl_seconds // 10)
+        self._last_prune_monotonic = 0.0
+        self._ensure_schema()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Serialize access to the shared connection inside one transaction."""
+        with self._lock, self._conn:
+            yield self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _ensure_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS attachment_uploads (
+                    token TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    mime_type TEXT NOT NULL,
+                    content_sha256 TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+
+    def ping(self) -> None:
+        """Open a connection and run a trivial query to warm the database."""
+        with self._connect() as conn:
+            conn.execute("SELECT 1").fetchone()
+
+    def put(self, *, user_id: str, mime_type: str, data: bytes) -> StagedUpload:
+        """Stage ``data`` for ``user_id`` and return its token and digest."""
+        upload = StagedUpload(
+            token=secrets.token_urlsafe(24),
+            user_id=user_id,
+            mime_type=mime_type,
+            content_sha256=hashlib.sha256(data).hexdigest(),
+            data=data,
+        )
+        now = time.time()
+        with self._connect() as conn:
+            if time.monotonic() - self._last_prune_monotonic >= self._prune_interval:
+                conn.execute(
+                    "DELETE FROM attachment_uploads WHERE created_at < ?",
+                    (now - self._ttl,),
+                )
+                self._last_prune_monotonic = time.monotonic()
+            conn.execute(
+                """
+                INSERT INTO attachment_uploads
+                    (token, user_id, mime_type, content_sha256, data, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    upload.token,
+                    user_id,
+                    mime_type,
+                    upload.content_sha256,
+                    data,
+                    now,
+                ),
+            )
+        return upload
+
+    def get(self, token: str, *, user_id: str) -> StagedUpload | None:
+        """Return the staged upload when it exists, is fresh and belongs to the user."""
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT token, user_id, mime_type, content_sha256, data
+                FROM attachment_uploads
+                WHERE token = ? AND user_id = ? AND created_at >= ?
+                """,
+                (token, user_id, time.time() - self._ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        return StagedUpload(
+            token=row["token"],
+            user_id=row["user_id"],
+            mime_type=row["mime_type"],
+            content_sha256=row["content_sha256"],
+            data=bytes(row["data"]),
+        )
+
+    def delete(self, token: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM attachment_uploads WHERE token = ?", (token,))
+
+
+__all__ = ["SQLiteUploadStore", "StagedUpload"]
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, Dict, List, Sequence
 
 import httpx
+import orjson
 
-from app.utils.http import RetryConfig, request_with_retry
+from app.utils.http import (
+    RetryConfig,
+    close_with_running_loop,
+    request_with_retry,
+)
 
 
 class WebSearchClient:
@@ -17,6 +23,8 @@ class WebSearchClient:
     def __init__(self, *, api_key: str, engine: str = "google") -> None:
         self._api_key = api_key
         self._engine = engine
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
 
     async def search(self, query: str, *, num_results: int = 5) -> List[Dict[str, Any]]:
         """Execute a search query and return simplified results."""
@@ -28,26 +36,67 @@ class WebSearchClient:
             "api_key": self._api_key,
         }
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await request_with_retry(
-                client.get,
-                self._BASE_URL,
-                params=params,
-                retry_config=RetryConfig(),
-            )
+        response = await request_with_retry(
+            self._http().get,
+            self._BASE_URL,
+            params=params,
+            retry_config=RetryConfig(),
+        )
+
+        payload = orjson.loads(response.content)
+        items = payload.get("organic_results") or ()
+        return [
+            {
+                "title": item.get("title"),
+                "link": item.get("link"),
+                "snippet": item.get("snippet"),
+                "position": item.get("position"),
+            }
+            for item in items[:num_results]
+        ]
+
+    async def search_many(
+        self,
+        queries: Sequence[str],
+        *,
+        num_results: int = 5,
+        concurrency: int = 4,
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several searches concurrently, preserving the order of ``queries``."""
+
+        # Bound the fan-out so bursts stay within SerpAPI's rate limits.
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _search_one(query: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.search(query, num_results=num_results)
+
+        return list(await asyncio.gather(*(_search_one(query) for query in queries)))
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client; call on application shutdown."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
 
-        payload = response.json()
-        results: List[Dict[str, Any]] = []
-        for item in payload.get("organic_results", [])[:num_results]:
-            results.append(
-                {
-                    "title": item.get("title"),
-                    "link": item.get("link"),
-                    "snippet": item.get("snippet"),
-                    "position": item.get("position"),
-                }
+    def _http(self) -> httpx.AsyncClient:
+        """Return a keep-alive client so repeated searches skip the TLS handshake."""
+        # Rebuild when the running loop changes (the Lambda handler starts a new
+        # loop per invocation and httpx pools are bound to the loop).
+        loop = asyncio.get_running_loop()
+        if (
+            self._client is None
+            or self._client.is_closed
+            or self._client_loop is not loop
+        ):
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=16),
             )
-        return results
+            self._client_loop = loop
+            close_with_running_loop(self._client)
+        return self._client
 
 
 __all__ = ["WebSearchClient"]
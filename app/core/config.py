@@ -6,11 +6,20 @@ analysis agent can share a consistent configuration surface.
 """
 
 import os
-from functools import lru_cache
+import sys
+from functools import cache, cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Annotated, Optional
 
-from pydantic import AnyHttpUrl, BaseSettings, Field, HttpUrl, validator
+from pydantic import AnyHttpUrl, Field, field_validator
+from pydantic_settings import (
+    BaseSettings,
+    NoDecode,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+
+from app.utils.urls import HttpUrlStr
 
 
 def _load_env_file(path: str = ".env") -> None:
@@ -18,91 +27,150 @@ def _load_env_file(path: str = ".env") -> None:
     env_path = Path(path)
     if not env_path.exists():
         return
+    pairs: dict[str, str] = {}
     for raw_line in env_path.read_text().splitlines():
         line = raw_line.strip()
-        if not line or line.startswith("#"):
+        if not line or line[0] == "#":
             continue
         key, sep, value = line.partition("=")
-        if not sep:
-            continue
         key = key.strip()
-        if not key or key in os.environ:
-            continue
-        cleaned = value.strip().strip('"').strip("'")
-        os.environ[key] = cleaned
+        if sep and key and key not in os.environ:
+            pairs.setdefault(key, value.strip().strip('"').strip("'"))
+    # Collected first so a key repeated in the file keeps its first value while
+    # the membership check above only ever sees the real process environment.
+    os.environ.update(pairs)
 
 
 _load_env_file()
 
 
-class GoogleSettings(BaseSettings):
+@lru_cache(maxsize=8)
+def _parse_scopes(value: str) -> tuple[str, ...]:
+    """Split a comma-separated scope list; repeated values reuse the tuple."""
+    scopes = map(str.strip, value.split(","))
+    return tuple(sys.intern(scope) for scope in scopes if scope)
+
+
+_DEFAULT_OAUTH_SCOPES: tuple[str, ...] = (
+    "https://www.googleapis.com/auth/drive.file",
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/userinfo.email",
+    "openid",
+)
+# Parse the environment value at import so OAuthSettings() hits the cache.
+_parse_scopes(os.environ.get("OAUTH_SCOPES", ""))
+
+
+class _Settings(BaseSettings):
+    """Shared behaviour: env aliases for loading, field names for overrides.
+
+    Sections are frozen (immutable and hashable) once loaded.
+    """
+
+    model_config = SettingsConfigDict(
+        populate_by_name=True,
+        extra="ignore",
+        frozen=True,
+        protected_namespaces=("settings_",),
+    )
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        """Read init kwargs and the environment only.
+
+        ``_load_env_file`` has already merged ``.env`` into ``os.environ`` at
+        import, so re-parsing the file (and probing a secrets dir) on every
+        section construction only repeats work on cold starts.
+        """
+        return init_settings, env_settings
+
+
+class GoogleSettings(_Settings):
     """Configuration required for interacting with Google APIs."""
 
-    client_id: str = Field(..., env="GOOGLE_CLIENT_ID")
-    client_secret: str = Field(..., env="GOOGLE_CLIENT_SECRET")
-    redirect_uri: AnyHttpUrl = Field(..., env="GOOGLE_REDIRECT_URI")
+    client_id: str = Field(..., validation_alias="GOOGLE_CLIENT_ID")
+    client_secret: str = Field(..., validation_alias="GOOGLE_CLIENT_SECRET")
+    redirect_uri: AnyHttpUrl = Field(..., validation_alias="GOOGLE_REDIRECT_URI")
     drive_root_folder_id: Optional[str] = Field(
         None,
-        env="GOOGLE_DRIVE_ROOT_FOLDER_ID",
+        validation_alias="GOOGLE_DRIVE_ROOT_FOLDER_ID",
         description="Optional target folder to contain uploaded assets.",
     )
 
 
-class AWSSettings(BaseSettings):
+class AWSSettings(_Settings):
     """Settings for AWS services used by the platform."""
 
-    region_name: str = Field("us-east-1", env="AWS_REGION")
-    sqs_queue_url: str = Field(..., env="ANALYSIS_QUEUE_URL")
+    region_name: str = Field("us-east-1", validation_alias="AWS_REGION")
+    sqs_queue_url: str = Field(..., validation_alias="ANALYSIS_QUEUE_URL")
+    sqs_wait_time_seconds: int = Field(
+        20,
+        validation_alias="ANALYSIS_QUEUE_WAIT_TIME_SECONDS",
+        ge=0,
+        le=20,
+        description="Long-poll wait applied when consumers receive queued jobs.",
+    )
     analysis_lambda_arn: Optional[str] = Field(
         None,
-        env="ANALYSIS_LAMBDA_ARN",
+        validation_alias="ANALYSIS_LAMBDA_ARN",
         description="Optional ARN used for tracing or warm invocations.",
     )
-    dynamodb_table_name: str = Field(..., env="DYNAMODB_TABLE_NAME")
+    dynamodb_table_name: str = Field(..., validation_alias="DYNAMODB_TABLE_NAME")
     eventbridge_bus_name: Optional[str] = Field(
         None,
-        env="EVENTBRIDGE_BUS_NAME",
+        validation_alias="EVENTBRIDGE_BUS_NAME",
         description=(
             "Custom bus for proactive analyses. Defaults to default bus when omitted."
         ),
     )
 
 
-class SecuritySettings(BaseSettings):
+class SecuritySettings(_Settings):
     """Security-related configuration."""
 
     token_encryption_secret: Optional[str] = Field(
         None,
-        env="TOKEN_ENCRYPTION_SECRET",
+        validation_alias="TOKEN_ENCRYPTION_SECRET",
         description=(
             "Secret used to derive the symmetric key for encrypting stored tokens."
         ),
     )
 
 
-class GeminiSettings(BaseSettings):
+class GeminiSettings(_Settings):
     """Configuration for Gemini model access."""
 
-    api_key: str = Field(..., env="GEMINI_API_KEY")
-    model_name: str = Field("gemini-1.5-pro", env="GEMINI_MODEL_NAME")
-    vision_model_name: str = Field("gemini-1.5-flash", env="GEMINI_VISION_MODEL_NAME")
+    api_key: str = Field(..., validation_alias="GEMINI_API_KEY")
+    model_name: str = Field("gemini-1.5-pro", validation_alias="GEMINI_MODEL_NAME")
+    vision_model_name: str = Field(
+        "gemini-1.5-flash", validation_alias="GEMINI_VISION_MODEL_NAME"
+    )
+    max_concurrency: int = Field(
+        4,
+        validation_alias="GEMINI_MAX_CONCURRENCY",
+        ge=1,
+        description="Maximum in-flight Gemini calls per model to stay within quota.",
+    )
 
 
-class OAuthSettings(BaseSettings):
+class OAuthSettings(_Settings):
     """OAuth flow configuration."""
 
-    state_ttl_seconds: int = Field(900, env="OAUTH_STATE_TTL")
-    scopes: tuple[str, ...] = Field(
-        (
-            "https://www.googleapis.com/auth/drive.file",
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/userinfo.email",
-            "openid",
-        ),
-        env="OAUTH_SCOPES",
+    state_ttl_seconds: int = Field(900, validation_alias="OAUTH_STATE_TTL")
+    # NoDecode hands OAUTH_SCOPES to the validator as-is instead of JSON-decoding.
+    scopes: Annotated[tuple[str, ...], NoDecode] = Field(
+        _DEFAULT_OAUTH_SCOPES, validation_alias="OAUTH_SCOPES"
     )
 
-    @validator("scopes", pre=True)
+    @field_validator("scopes", mode="before")
+    @classmethod
     def _split_scopes(
         cls, value: str | tuple[str, ...] | list[str]
     ) -> tuple[str, ...]:
@@ -111,20 +179,22 @@ class OAuthSettings(BaseSettings):
             return value
         if isinstance(value, list):
             return tuple(value)
-        return tuple(scope.strip() for scope in value.split(",") if scope.strip())
+        return _parse_scopes(value)
 
-    class Config:
-        env_json_loads = staticmethod(lambda v: v)
+    @cached_property
+    def scope_param(self) -> str:
+        """Scopes as the space-separated ``scope`` query value Google expects."""
+        return " ".join(self.scopes)
 
 
-class AppSettings(BaseSettings):
+class AppSettings(_Settings):
     """Root settings object for the FastAPI application."""
 
-    environment: str = Field("development", env="APP_ENV")
-    log_level: str = Field("INFO", env="APP_LOG_LEVEL")
-    frontend_base_url: Optional[HttpUrl] = Field(
+    environment: str = Field("development", validation_alias="APP_ENV")
+    log_level: str = Field("INFO", validation_alias="APP_LOG_LEVEL")
+    frontend_base_url: Optional[HttpUrlStr] = Field(
         None,
-        env="FRONTEND_BASE_URL",
+        validation_alias="FRONTEND_BASE_URL",
         description="Optional URL for redirecting users back to the front-end.",
     )
     security: SecuritySettings = Field(default_factory=SecuritySettings)
@@ -134,40 +204,45 @@ class AppSettings(BaseSettings):
     gemini: GeminiSettings = Field(default_factory=GeminiSettings)
     serpapi_api_key: Optional[str] = Field(
         None,
-        env="SERPAPI_API_KEY",
+        validation_alias="SERPAPI_API_KEY",
         description="Optional SerpAPI key used for web research integration.",
     )
     telegram_bot_token: Optional[str] = Field(
         None,
-        env="TELEGRAM_BOT_TOKEN",
+        validation_alias="TELEGRAM_BOT_TOKEN",
         description="Telegram bot token used for webhook authentication.",
     )
     telegram_default_sheet_id: Optional[str] = Field(
         None,
-        env="TELEGRAM_DEFAULT_SHEET_ID",
+        validation_alias="TELEGRAM_DEFAULT_SHEET_ID",
         description="Default Google Sheet ID used for Telegram submissions.",
     )
-    telegram_connect_base_url: Optional[HttpUrl] = Field(
+    telegram_connect_base_url: Optional[HttpUrlStr] = Field(
         None,
-        env="TELEGRAM_CONNECT_BASE_URL",
+        validation_alias="TELEGRAM_CONNECT_BASE_URL",
         description=(
             "Optional base URL used to generate Google OAuth links for Telegram users."
         ),
     )
     trade_capture_db_path: str = Field(
         "data/trade_capture.db",
-        env="TRADE_CAPTURE_DB_PATH",
+        validation_alias="TRADE_CAPTURE_DB_PATH",
         description=(
             "SQLite database path used for conversational trade capture sessions."
         ),
     )
+    io_thread_pool_size: int = Field(
+        64,
+        validation_alias="IO_THREAD_POOL_SIZE",
+        ge=1,
+        description="Worker threads available to blocking I/O run via to_thread.",
+    )
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    # The root stays mutable so request-scoped overrides can patch a deep copy.
+    model_config = SettingsConfigDict(frozen=False)
 
 
-@lru_cache()
+@cache
 def get_settings() -> AppSettings:
     """Return a cached settings object."""
     return AppSettings()  # type: ignore[call-arg]
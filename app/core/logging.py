@@ -7,14 +7,25 @@ Provides a consistent logging format and configuration.
 import logging
 import sys
 
+_FORMATTER = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+
 
 def configure_logging(level: str = "INFO") -> None:
     """Configure root logging with a sensible default format."""
-    logging.basicConfig(
-        level=level.upper(),
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        stream=sys.stdout,
-    )
+    # The format never prints thread or process details, so skip collecting
+    # them for every LogRecord.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    # Like basicConfig, leave handlers installed by the host (Lambda runtime,
+    # pytest) in place.
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(_FORMATTER)
+        root.addHandler(handler)
 
 
 __all__ = ["configure_logging"]
@@ -1,12 +1,15 @@
 """Expose dependency helpers for FastAPI routers."""
 
 from .clients import (
+    close_clients,
     get_analysis_queue_service,
     get_drive_client,
     get_gemini_client,
     get_google_oauth_client,
     get_google_token_service,
+    get_ingestion_queue_service,
     get_oauth_state_encoder,
+    get_queue_client,
     get_sheets_client,
     get_sqlite_store,
     get_telegram_conversation_assistant,
@@ -14,25 +17,32 @@ from .clients import (
     get_trade_capture_store,
     get_trade_extraction_service,
     get_trade_ingestion_service,
+    get_upload_store,
     get_web_search_client,
+    warm_clients,
 )
 from .config import SettingsDependency, get_app_settings
 
 __all__ = [
     "SettingsDependency",
+    "close_clients",
     "get_analysis_queue_service",
     "get_app_settings",
     "get_drive_client",
     "get_gemini_client",
     "get_google_oauth_client",
     "get_google_token_service",
+    "get_ingestion_queue_service",
     "get_token_cipher_service",
     "get_trade_extraction_service",
     "get_web_search_client",
     "get_oauth_state_encoder",
+    "get_queue_client",
     "get_sheets_client",
     "get_trade_ingestion_service",
     "get_trade_capture_store",
     "get_telegram_conversation_assistant",
     "get_sqlite_store",
+    "get_upload_store",
+    "warm_clients",
 ]
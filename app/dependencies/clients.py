@@ -1,86 +1,112 @@
 """
 Factory functions to provide shared clients and services as FastAPI dependencies.
-"""
 
-from functools import lru_cache
-
-from app.clients import (
-    GeminiClient,
-    GoogleDriveClient,
-    GoogleOAuthClient,
-    GoogleSheetsClient,
-    OAuthStateEncoder,
-    SQLiteQueueClient,
-    SQLiteStore,
-    WebSearchClient,
-)
-from app.core.config import get_settings
-from app.services import (
-    AnalysisQueueService,
-    GoogleTokenService,
-    TelegramConversationalAssistant,
-    TokenCipherService,
-    TradeCaptureStore,
-    TradeExtractionService,
-    TradeIngestionService,
-)
+Client and service modules are imported inside each factory so a process only
+pays for the SDKs (Gemini, Google API discovery, ...) it actually uses; the
+caches make that a once-per-process cost.
+"""
 
+from __future__ import annotations
 
-@lru_cache()
-def _settings():
-    """Internal helper to cache settings for client factories."""
-    return get_settings()
+import logging
+from functools import cache
+from typing import TYPE_CHECKING, Any, Callable
 
+from app.core.config import get_settings
 
-@lru_cache()
+if TYPE_CHECKING:
+    from app.clients.gemini import GeminiClient
+    from app.clients.google_auth import GoogleOAuthClient, OAuthStateEncoder
+    from app.clients.google_drive import GoogleDriveClient
+    from app.clients.google_sheets import GoogleSheetsClient
+    from app.clients.local_queue import SQLiteQueueClient
+    from app.clients.sqlite_store import SQLiteStore
+    from app.clients.upload_store import SQLiteUploadStore
+    from app.clients.web_search import WebSearchClient
+    from app.services.analysis_queue import AnalysisQueueService
+    from app.services.google_tokens import GoogleTokenService
+    from app.services.ingestion_queue import IngestionQueueService
+    from app.services.telegram_conversation import TelegramConversationalAssistant
+    from app.services.token_cipher import TokenCipherService
+    from app.services.trade_capture import TradeCaptureStore
+    from app.services.trade_extraction import TradeExtractionService
+    from app.services.trade_ingestion import TradeIngestionService
+
+
+logger = logging.getLogger(__name__)
+
+
+@cache
 def get_oauth_state_encoder() -> OAuthStateEncoder:
     """Provide an OAuth state encoder derived from the Google client secret."""
-    settings = _settings()
+    from app.clients.google_auth import OAuthStateEncoder
+
+    settings = get_settings()
     return OAuthStateEncoder(secret_key=settings.google.client_secret)
 
 
-@lru_cache()
+@cache
 def get_google_oauth_client() -> GoogleOAuthClient:
     """Create a singleton Google OAuth client."""
-    settings = _settings()
+    from app.clients.google_auth import GoogleOAuthClient
+
+    settings = get_settings()
     return GoogleOAuthClient(settings.google, settings.oauth)
 
 
-@lru_cache()
+@cache
 def get_drive_client() -> GoogleDriveClient:
     """Provide Google Drive client instance."""
-    settings = _settings()
+    from app.clients.google_drive import GoogleDriveClient
+
+    settings = get_settings()
     return GoogleDriveClient(
         token_service=get_google_token_service(),
         drive_root_folder_id=settings.google.drive_root_folder_id,
     )
 
 
-@lru_cache()
+@cache
 def get_sheets_client() -> GoogleSheetsClient:
     """Provide Google Sheets client instance."""
+    from app.clients.google_sheets import GoogleSheetsClient
+
     return GoogleSheetsClient(get_google_token_service())
 
 
-@lru_cache()
-@lru_cache()
+@cache
 def get_sqlite_store() -> SQLiteStore:
     """Provide shared SQLite record store."""
-    settings = _settings()
+    from app.clients.sqlite_store import SQLiteStore
+
+    settings = get_settings()
     return SQLiteStore(settings.trade_capture_db_path)
 
 
-@lru_cache()
+@cache
 def get_queue_client() -> SQLiteQueueClient:
     """Provide SQLite-backed queue client."""
-    settings = _settings()
+    from app.clients.local_queue import SQLiteQueueClient
+
+    settings = get_settings()
     return SQLiteQueueClient(settings.trade_capture_db_path)
 
 
-@lru_cache()
+@cache
+def get_upload_store() -> SQLiteUploadStore:
+    """Provide SQLite-backed staging for uploaded attachment bytes."""
+    from app.clients.upload_store import SQLiteUploadStore
+
+    settings = get_settings()
+    return SQLiteUploadStore(settings.trade_capture_db_path)
+
+
+@cache
 def get_google_token_service() -> GoogleTokenService:
     """Provide helper for managing Google OAuth tokens."""
-    settings = _settings()
+    from app.services.google_tokens import GoogleTokenService
+
+    settings = get_settings()
     return GoogleTokenService(
         store=get_sqlite_store(),
         oauth_client=get_google_oauth_client(),
@@ -90,74 +116,154 @@ def get_google_token_service() -> GoogleTokenService:
     )
 
 
-@lru_cache()
+@cache
 def get_token_cipher_service() -> TokenCipherService:
     """Provide symmetric encryption helper for token storage."""
-    settings = _settings()
+    from app.services.token_cipher import TokenCipherService
+
+    settings = get_settings()
     secret = settings.security.token_encryption_secret or settings.google.client_secret
     return TokenCipherService(secret=secret)
 
 
-@lru_cache()
+@cache
 def get_gemini_client() -> GeminiClient:
     """Provide Gemini client instance."""
-    settings = _settings()
+    from app.clients.gemini import GeminiClient
+
+    settings = get_settings()
     return GeminiClient(settings.gemini)
 
 
-@lru_cache()
+@cache
 def get_web_search_client() -> WebSearchClient | None:
     """Provide web search client when SerpAPI is configured."""
-    settings = _settings()
+    from app.clients.web_search import WebSearchClient
+
+    settings = get_settings()
     api_key = settings.serpapi_api_key
     if not api_key:
         return None
     return WebSearchClient(api_key=api_key)
 
 
+@cache
 def get_trade_extraction_service() -> TradeExtractionService:
-    """Build a trade extraction service using Gemini."""
+    """Provide a shared trade extraction service using Gemini."""
+    from app.services.trade_extraction import TradeExtractionService
+
     return TradeExtractionService(get_gemini_client())
 
 
+@cache
 def get_trade_ingestion_service() -> TradeIngestionService:
-    """Build a trade ingestion service using configured clients."""
+    """Provide a shared trade ingestion service using configured clients."""
+    from app.services.trade_ingestion import TradeIngestionService
+
     return TradeIngestionService(
         drive_client=get_drive_client(),
         sheets_client=get_sheets_client(),
+        upload_store=get_upload_store(),
     )
 
 
-@lru_cache()
+@cache
 def get_telegram_conversation_assistant() -> TelegramConversationalAssistant:
     """Provide conversational helper for Telegram interactions."""
+    from app.services.telegram_conversation import TelegramConversationalAssistant
+
     return TelegramConversationalAssistant(get_gemini_client())
 
 
+@cache
 def get_analysis_queue_service() -> AnalysisQueueService:
-    """Build an analysis queue service."""
+    """Provide a shared analysis queue service."""
+    from app.services.analysis_queue import AnalysisQueueService
+
     return AnalysisQueueService(
         queue_client=get_queue_client(),
         store=get_sqlite_store(),
     )
 
 
-@lru_cache()
+@cache
+def get_ingestion_queue_service() -> IngestionQueueService:
+    """Provide a shared trade ingestion queue service."""
+    from app.services.ingestion_queue import IngestionQueueService
+
+    return IngestionQueueService(
+        queue_client=get_queue_client(),
+        store=get_sqlite_store(),
+    )
+
+
+@cache
 def get_trade_capture_store() -> TradeCaptureStore:
     """Provide a process-local trade capture store."""
-    settings = _settings()
+    from app.services.trade_capture import TradeCaptureStore
+
+    settings = get_settings()
     return TradeCaptureStore(
         db_path=settings.trade_capture_db_path,
     )
 
 
+# Singletons built at startup so the first request does not pay for them.
+_SHARED_FACTORIES: dict[str, Callable[[], Any]] = {
+    "token_cipher": get_token_cipher_service,
+    "oauth_state_encoder": get_oauth_state_encoder,
+    "google_oauth_client": get_google_oauth_client,
+    "sqlite_store": get_sqlite_store,
+    "queue_client": get_queue_client,
+    "upload_store": get_upload_store,
+    "trade_capture_store": get_trade_capture_store,
+    "google_token_service": get_google_token_service,
+    "drive_client": get_drive_client,
+    "sheets_client": get_sheets_client,
+    "gemini_client": get_gemini_client,
+    "web_search_client": get_web_search_client,
+    "trade_extraction_service": get_trade_extraction_service,
+    "trade_ingestion_service": get_trade_ingestion_service,
+    "analysis_queue_service": get_analysis_queue_service,
+    "ingestion_queue_service": get_ingestion_queue_service,
+    "telegram_assistant": get_telegram_conversation_assistant,
+}
+
+
+def warm_clients() -> None:
+    """Build the shared singletons and prime their storage ahead of traffic."""
+    for name, factory in _SHARED_FACTORIES.items():
+        try:
+            client = factory()
+            if name in ("sqlite_store", "queue_client", "upload_store"):
+                client.ping()
+        except Exception:  # pragma: no cover - factories retry lazily per request
+            logger.warning(
+                "Could not build %s at startup; continuing with lazy init.",
+                name,
+                exc_info=True,
+            )
+
+
+async def close_clients() -> None:
+    """Release pooled network resources held by the shared clients."""
+    if get_google_oauth_client.cache_info().currsize:
+        await get_google_oauth_client().aclose()
+    if get_web_search_client.cache_info().currsize:
+        web_search_client = get_web_search_client()
+        if web_search_client is not None:
+            await web_search_client.aclose()
+
+
 __all__ = [
+    "close_clients",
     "get_analysis_queue_service",
     "get_drive_client",
     "get_gemini_client",
     "get_google_oauth_client",
     "get_token_cipher_service",
     "get_google_token_service",
+    "get_ingestion_queue_service",
     "get_oauth_state_encoder",
     "get_telegram_conversation_assistant",
     "get_web_search_client",
@@ -167,4 +273,6 @@ __all__ = [
     "get_trade_capture_store",
     "get_sqlite_store",
     "get_queue_client",
+    "get_upload_store",
+    "warm_clients",
 ]
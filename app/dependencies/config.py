@@ -2,22 +2,21 @@
 FastAPI dependency utilities for injecting configuration and shared clients.
 """
 
-from functools import lru_cache
-
-from fastapi import Depends
+from fastapi import Depends, Request
 
 from app.core.config import AppSettings, get_settings
 
 
-@lru_cache()
-def _settings_singleton() -> AppSettings:
-    """Ensure configuration is created once per process."""
-    return get_settings()
-
+def get_app_settings(request: Request) -> AppSettings:
+    """FastAPI dependency returning the settings published on ``app.state``.
 
-def get_app_settings() -> AppSettings:
-    """FastAPI dependency returning application settings."""
-    return _settings_singleton()
+    Falls back to ``get_settings()`` when the lifespan has not run (e.g. an
+    ASGI transport without lifespan events).
+    """
+    settings = getattr(request.app.state, "settings", None)
+    if settings is None:
+        return get_settings()
+    return settings
 
 
 SettingsDependency = Depends(get_app_settings)
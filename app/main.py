@@ -4,11 +4,17 @@ FastAPI application entrypoint for the trading journal agent.
 
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
 from app.api.routes import router as api_router
 from app.core.config import get_settings
 from app.core.logging import configure_logging
+from app.dependencies import close_clients, warm_clients
 
 
 def create_app() -> FastAPI:
@@ -16,10 +22,32 @@ def create_app() -> FastAPI:
     settings = get_settings()
     configure_logging(settings.log_level)
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        # SQLite, Drive and Sheets calls go through asyncio.to_thread; the
+        # default executor (cpu_count + 4 threads) queues them under load.
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(
+                max_workers=settings.io_thread_pool_size, thread_name_prefix="io"
+            )
+        )
+        app.state.settings = settings
+        # Build every shared client before the first request; the cached
+        # dependency factories then hand out the same instances.
+        warm_clients()
+        # FastAPI builds and caches the OpenAPI document on first use; do it
+        # now rather than on the first /openapi.json or /docs request.
+        app.openapi()
+        try:
+            yield
+        finally:
+            await close_clients()
+
     app = FastAPI(
         title="AI-Powered Trading Journal Agent",
         version="0.1.0",
         description="REST API for trade ingestion and analysis orchestration.",
+        lifespan=lifespan,
     )
     app.include_router(api_router, prefix="/api")
     return app
@@ -2,10 +2,17 @@
 Domain models for OAuth token persistence.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 
 from pydantic import BaseModel, Field
 
+_UTC = timezone.utc
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware replacement for the deprecated ``datetime.utcnow``."""
+    return datetime.now(_UTC)
+
 
 class StoredOAuthToken(BaseModel):
     """Represents a token record stored in DynamoDB."""
@@ -15,8 +22,8 @@ class StoredOAuthToken(BaseModel):
     access_token: str
     refresh_token: str
     expires_at: datetime
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
 
 
 __all__ = ["StoredOAuthToken"]
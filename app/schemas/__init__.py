@@ -8,6 +8,7 @@ from .trade import (
     TelegramUpdate,
     TradeAttachment,
     TradeFileLink,
+    TradeIngestionAccepted,
     TradeIngestionRequest,
     TradeIngestionResponse,
     TradeSubmissionRequest,
@@ -22,6 +23,7 @@ __all__ = [
     "TelegramUpdate",
     "TradeAttachment",
     "TradeFileLink",
+    "TradeIngestionAccepted",
     "TradeIngestionRequest",
     "TradeIngestionResponse",
     "TradeSubmissionRequest",
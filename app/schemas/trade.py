@@ -2,17 +2,34 @@
 Pydantic models for trade ingestion and analysis requests.
 """
 
+import sys
 from datetime import datetime
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import (
+    AliasChoices,
+    AliasGenerator,
+    BaseModel,
+    ConfigDict,
+    Field,
+    field_validator,
+    model_validator,
+)
+from pydantic.alias_generators import to_camel
+
+from app.utils.urls import HttpUrlStr
+
+# Request bodies accept ``user_id`` or ``userId`` style keys; output stays snake.
+_SNAKE_OR_CAMEL = AliasGenerator(
+    validation_alias=lambda name: AliasChoices(name, to_camel(name))
+)
 
 
 class TradeFileLink(BaseModel):
     """Represents a file uploaded to Google Drive."""
 
     drive_file_id: str = Field(..., description="The unique identifier of the file.")
-    shareable_link: HttpUrl = Field(
+    shareable_link: HttpUrlStr = Field(
         ..., description="Public or permissioned link to access the file."
     )
     mime_type: str = Field(..., description="MIME type describing the file.")
@@ -47,26 +64,69 @@ class TradeIngestionRequest(BaseModel):
         description="Base64 encoded voice note describing the trade.",
     )
 
+    model_config = ConfigDict(
+        extra="ignore", populate_by_name=True, alias_generator=_SNAKE_OR_CAMEL
+    )
+
+    @field_validator("ticker", "position_type")
+    @classmethod
+    def _intern(cls, value: str) -> str:
+        """Share one string object per distinct ticker / position type."""
+        return sys.intern(value)
+
 
 class TradeIngestionResponse(BaseModel):
-    """Response payload returned after logging a trade."""
+    """Response payload returned after logging a trade.
+
+    Routes serialize it via ``_model_response`` with ``response_model=None`` so
+    FastAPI does not re-validate the instance; keep it that way.
+    """
 
     sheet_row_id: str = Field(..., description="Identifier of the inserted sheet row.")
     uploaded_files: list[TradeFileLink] = Field(default_factory=list)
 
 
+class TradeIngestionAccepted(BaseModel):
+    """Acknowledgement returned when a trade is queued for background ingestion."""
+
+    status: Literal["accepted"] = Field(
+        "accepted", description="Ingestion has been queued for the worker."
+    )
+    job_id: str = Field(..., description="Identifier used to poll ingestion status.")
+
+
 class TradeAttachment(BaseModel):
-    """Represents a generic attachment supplied by the user."""
+    """Represents a generic attachment supplied by the user.
+
+    Prefer ``upload_token`` (from ``POST /api/attachments``) over inline
+    ``file_b64`` so large files stay out of JSON validation and job payloads.
+    """
 
     filename: str = Field(..., description="Desired file name including extension.")
     mime_type: str = Field(
         ..., description="MIME type for the attachment (e.g., image/png)."
     )
-    file_b64: str = Field(..., description="Base64-encoded file contents.")
+    file_b64: Optional[str] = Field(
+        None,
+        description="Base64-encoded file contents (deprecated; use upload_token).",
+        json_schema_extra={"deprecated": True},
+    )
+    upload_token: Optional[str] = Field(
+        None, description="Token returned by the attachment upload endpoint."
+    )
+    content_sha256: Optional[str] = Field(
+        None, description="Hex SHA-256 of the uploaded bytes, verified on ingest."
+    )
     tags: list[str] = Field(
         default_factory=list, description="Optional attachment descriptors."
     )
 
+    @model_validator(mode="after")
+    def _require_one_source(self) -> "TradeAttachment":
+        if (self.file_b64 is None) == (self.upload_token is None):
+            raise ValueError("Provide exactly one of file_b64 or upload_token.")
+        return self
+
 
 class TradeSubmissionRequest(BaseModel):
     """Raw user submission that the main agent will structure via Gemini."""
@@ -100,6 +160,8 @@ class TradeSubmissionRequest(BaseModel):
     )
     notes: Optional[str] = Field(None, description="Optional additional notes.")
 
+    model_config = ConfigDict(extra="ignore")
+
 
 class TradeSubmissionResult(BaseModel):
     """Response envelope for conversational trade submission workflow."""
@@ -152,13 +214,14 @@ class TelegramMessage(BaseModel):
     voice: Optional[Dict[str, Any]] = None
     video: Optional[Dict[str, Any]] = None
     chat: Dict[str, Any]
-    from_: Optional[Dict[str, Any]] = Field(None, alias="from")
+    from_: Optional[Dict[str, Any]] = Field(
+        None, validation_alias="from", serialization_alias="from"
+    )
 
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
 
 
-TelegramUpdate.update_forward_refs()
+TelegramUpdate.model_rebuild()
 
 
 class AnalysisRequest(BaseModel):
@@ -180,6 +243,10 @@ class AnalysisRequest(BaseModel):
         None, description="Optional window end for historical data consideration."
     )
 
+    model_config = ConfigDict(
+        extra="ignore", populate_by_name=True, alias_generator=_SNAKE_OR_CAMEL
+    )
+
 
 class AnalysisJobStatus(BaseModel):
     """Represents the state of an analysis job stored in DynamoDB."""
@@ -189,13 +256,20 @@ class AnalysisJobStatus(BaseModel):
     status: str
     requested_at: datetime
     completed_at: Optional[datetime] = None
-    result_location: Optional[HttpUrl] = None
+    result_location: Optional[HttpUrlStr] = None
+
+    @field_validator("status")
+    @classmethod
+    def _intern(cls, value: str) -> str:
+        """Share one string object per job status."""
+        return sys.intern(value)
 
 
 __all__ = [
     "AnalysisJobStatus",
     "AnalysisRequest",
     "TradeFileLink",
+    "TradeIngestionAccepted",
     "TradeIngestionRequest",
     "TradeIngestionResponse",
     "TradeSubmissionRequest",
@@ -1,17 +1,56 @@
-"""Service layer exports."""
+"""Service layer exports.
+
+Like ``app.clients``, submodules load on first attribute access so workers
+that need one service do not import the Gemini SDK through the others.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .analysis_queue import AnalysisQueueService
+    from .google_tokens import GoogleTokenService
+    from .ingestion_queue import IngestionQueueService
+    from .telegram_conversation import (
+        GeminiModelError,
+        TelegramConversationalAssistant,
+    )
+    from .token_cipher import TokenCipherService
+    from .trade_capture import TradeCaptureSession, TradeCaptureStore
+    from .trade_extraction import ExtractionResult, TradeExtractionService
+    from .trade_ingestion import TradeIngestionService
+
+_EXPORTS = {
+    "AnalysisQueueService": ".analysis_queue",
+    "ExtractionResult": ".trade_extraction",
+    "GoogleTokenService": ".google_tokens",
+    "IngestionQueueService": ".ingestion_queue",
+    "TokenCipherService": ".token_cipher",
+    "TradeCaptureSession": ".trade_capture",
+    "TradeCaptureStore": ".trade_capture",
+    "TradeExtractionService": ".trade_extraction",
+    "TradeIngestionService": ".trade_ingestion",
+    "TelegramConversationalAssistant": ".telegram_conversation",
+    "GeminiModelError": ".telegram_conversation",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-from .analysis_queue import AnalysisQueueService
-from .google_tokens import GoogleTokenService
-from .token_cipher import TokenCipherService
-from .trade_capture import TradeCaptureSession, TradeCaptureStore
-from .trade_extraction import ExtractionResult, TradeExtractionService
-from .trade_ingestion import TradeIngestionService
-from .telegram_conversation import TelegramConversationalAssistant, GeminiModelError
 
 __all__ = [
     "AnalysisQueueService",
     "ExtractionResult",
     "GoogleTokenService",
+    "IngestionQueueService",
     "TokenCipherService",
     "TradeCaptureSession",
     "TradeCaptureStore",
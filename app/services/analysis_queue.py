@@ -4,8 +4,9 @@ Service helpers for enqueuing analysis jobs.
 
 from __future__ import annotations
 
+import secrets
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from app.clients import SQLiteQueueClient
 from app.clients.sqlite_store import SQLiteStore
@@ -15,59 +16,94 @@ from app.schemas import AnalysisRequest
 class AnalysisQueueService:
     """Queue asynchronous analysis jobs and track their lifecycle."""
 
+    __slots__ = ("_queue", "_store")
+
     def __init__(self, queue_client: SQLiteQueueClient, store: SQLiteStore) -> None:
         self._queue = queue_client
         self._store = store
 
     def enqueue_analysis(self, *, request: AnalysisRequest) -> str:
         """Create a job record and enqueue the task."""
-        job_id = self._build_job_id(request.user_id)
-        payload = self._build_message_payload(job_id=job_id, request=request)
+        # One clock read so the job id and both requested_at values agree.
+        now = datetime.now(tz=timezone.utc)
+        job_id = self._build_job_id(request.user_id, now=now)
+        payload = self._build_message_payload(job_id=job_id, request=request, now=now)
+
+        # Persist pending status in DynamoDB. Datetimes are left to orjson, which
+        # writes the same ISO 8601 text as isoformat() when the item is stored.
+        item = self._build_job_item(job_id=job_id, request=request, now=now)
+        self._store.put_item(item)
+
+        self._queue.enqueue_analysis_request(payload)
+        return job_id
+
+    def enqueue_many(self, *, requests: List[AnalysisRequest]) -> List[str]:
+        """Create and enqueue several jobs with one store write and one queue write.
+
+        Job ids stay unique within the shared timestamp via their random suffix.
+        """
+        now = datetime.now(tz=timezone.utc)
+        job_ids: List[str] = []
+        items: List[Dict[str, Any]] = []
+        payloads: List[Dict[str, Any]] = []
+        for request in requests:
+            job_id = self._build_job_id(request.user_id, now=now)
+            job_ids.append(job_id)
+            items.append(self._build_job_item(job_id=job_id, request=request, now=now))
+            payloads.append(
+                self._build_message_payload(job_id=job_id, request=request, now=now)
+            )
+
+        self._store.put_items(items)
+        self._queue.enqueue_analysis_requests(payloads)
+        return job_ids
+
+    @staticmethod
+    def _build_job_id(user_id: str, *, now: datetime) -> str:
+        """Generate a time-sortable job identifier.
 
-        # Persist pending status in DynamoDB.
-        now_iso = datetime.now(tz=timezone.utc).isoformat()
+        The random suffix keeps two jobs enqueued in the same second distinct.
+        """
+        return f"{user_id}-{int(now.timestamp()):010d}-{secrets.token_hex(4)}"
+
+    @staticmethod
+    def _build_job_item(
+        *, job_id: str, request: AnalysisRequest, now: datetime
+    ) -> Dict[str, Any]:
+        """Construct the pending job record tracked in the store."""
         item: Dict[str, Any] = {
             "pk": f"user#{request.user_id}",
             "sk": f"analysis#{job_id}",
             "status": "pending",
-            "requested_at": now_iso,
+            "requested_at": now,
             "prompt": request.prompt,
             "sheet_id": request.sheet_id,
         }
         if request.sheet_range:
             item["sheet_range"] = request.sheet_range
         if request.start_date:
-            item["start_date"] = request.start_date.isoformat()
+            item["start_date"] = request.start_date
         if request.end_date:
-            item["end_date"] = request.end_date.isoformat()
-
-        self._store.put_item(item)
-
-        self._queue.enqueue_analysis_request(payload)
-        return job_id
-
-    @staticmethod
-    def _build_job_id(user_id: str) -> str:
-        """Generate a deterministic job identifier."""
-        timestamp = datetime.now(tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-        return f"{user_id}-{timestamp}"
+            item["end_date"] = request.end_date
+        return item
 
     @staticmethod
     def _build_message_payload(
-        *, job_id: str, request: AnalysisRequest
+        *, job_id: str, request: AnalysisRequest, now: datetime
     ) -> Dict[str, Any]:
-        """Construct the message payload for the analysis worker."""
+        """Construct the message payload for the analysis worker.
+
+        The queue client serializes with orjson, which encodes datetimes itself.
+        """
         return {
             "job_id": job_id,
             "user_id": request.user_id,
             "prompt": request.prompt,
             "sheet_id": request.sheet_id,
             "sheet_range": request.sheet_range,
-            "start_date": request.start_date.isoformat()
-            if request.start_date
-            else None,
-            "end_date": request.end_date.isoformat() if request.end_date else None,
-            "requested_at": datetime.now(tz=timezone.utc).isoformat(),
+            "start_date": request.start_date,
+            "end_date": request.end_date,
+            "requested_at": now,
         }
 
 
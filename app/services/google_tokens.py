@@ -4,8 +4,10 @@ Helpers for retrieving and refreshing Google OAuth tokens.
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import datetime, timezone
 
+from cachetools import LRUCache
 from google.oauth2.credentials import Credentials
 
 from app.clients import GoogleOAuthClient
@@ -18,7 +20,21 @@ from app.services.token_cipher import TokenCipherService
 class GoogleTokenService:
     """Manages access to persisted Google OAuth tokens."""
 
-    _REFRESH_WINDOW = timedelta(minutes=5)
+    __slots__ = (
+        "_store",
+        "_oauth",
+        "_cipher",
+        "_token_uri",
+        "_client_id",
+        "_client_secret",
+        "_scopes_list",
+        "_credentials_cache",
+    )
+
+    _REFRESH_SECS = 300
+    # How long a cached credential is served before the stored record is
+    # re-read to pick up a reconnect or another process's refresh.
+    _RECHECK_SECS = 60
 
     def __init__(
         self,
@@ -30,12 +46,31 @@ class GoogleTokenService:
     ) -> None:
         self._store = store
         self._oauth = oauth_client
-        self._google = google_settings
-        self._oauth_settings = oauth_settings
         self._cipher = token_cipher
+        # Constant Credentials arguments, resolved once instead of per build.
+        self._token_uri = GoogleOAuthClient.TOKEN_URL
+        self._client_id = google_settings.client_id
+        self._client_secret = google_settings.client_secret
+        self._scopes_list = list(oauth_settings.scopes)
+        # user_id -> (encrypted access token, expiry, credentials, checked at).
+        # Matched against the stored ciphertext once the recheck interval lapses
+        # so a reconnect or another process's refresh misses.
+        self._credentials_cache: LRUCache[
+            str, tuple[str, float, Credentials, float]
+        ] = LRUCache(maxsize=1024)
 
     async def get_credentials(self, *, user_id: str) -> Credentials:
         """Retrieve credentials for a user, refreshing tokens when necessary."""
+        # One clock read serves the cache checks, migration stamp and refresh.
+        now = time.time()
+        cached = self._credentials_cache.get(user_id)
+        if (
+            cached is not None
+            and now - cached[3] < self._RECHECK_SECS
+            and not self._should_refresh(cached[1], now)
+        ):
+            return cached[2]
+
         record = self._store.get_item(
             partition_key=f"user#{user_id}",
             sort_key="oauth#google",
@@ -65,42 +100,82 @@ class GoogleTokenService:
             raise OAuthTokenNotFoundError(
                 "Legacy token record missing expiration; re-authentication required."
             )
+        if isinstance(expires_at, str):
+            # Records written before expires_at moved to epoch seconds.
+            expires_at_dt = datetime.fromisoformat(expires_at)
+            if expires_at_dt.tzinfo is None:
+                expires_at_dt = expires_at_dt.replace(tzinfo=timezone.utc)
+            expires_at = expires_at_dt.timestamp()
+            record["expires_at"] = expires_at
+            update_required = True
         if update_required:
-            record["updated_at"] = datetime.now(timezone.utc).isoformat()
-            self._store.put_item(record)
+            # Written once below, together with any refresh.
+            record["updated_at"] = _isoformat(now)
 
         if not encrypted_access_token or not encrypted_refresh_token or not expires_at:
             raise OAuthTokenNotFoundError(
                 "Stored OAuth token is missing required fields."
             )
 
+        if (
+            cached is not None
+            and cached[0] == encrypted_access_token
+            and not self._should_refresh(cached[1], now)
+        ):
+            self._credentials_cache[user_id] = (*cached[:3], now)
+            if update_required:
+                self._store.put_item(record)
+            return cached[2]
+
         access_token = self._cipher.decrypt(encrypted_access_token)
         refresh_token = self._cipher.decrypt(encrypted_refresh_token)
 
-        expires_at_dt = datetime.fromisoformat(expires_at)
-        now = datetime.now(timezone.utc)
-        if expires_at_dt.tzinfo is None:
-            expires_at_dt = expires_at_dt.replace(tzinfo=timezone.utc)
-
-        if expires_at_dt <= now + self._REFRESH_WINDOW:
-            refreshed_at = datetime.now(timezone.utc)
+        if self._should_refresh(expires_at, now):
             access_token, expires_in = await self._oauth.refresh_token(refresh_token)
-            expires_at_dt = refreshed_at + timedelta(seconds=expires_in)
-            record["access_token_encrypted"] = self._cipher.encrypt(access_token)
-            record["expires_at"] = expires_at_dt.isoformat()
-            record["updated_at"] = refreshed_at.isoformat()
+            expires_at = now + expires_in
+            encrypted_access_token = self._cipher.encrypt(access_token)
+            record["access_token_encrypted"] = encrypted_access_token
+            record["expires_at"] = expires_at
+            record["updated_at"] = _isoformat(now)
+            update_required = True
+        if update_required:
             self._store.put_item(record)
 
+        # google-auth compares against naive UTC datetimes.
+        expiry = datetime.fromtimestamp(expires_at, timezone.utc).replace(tzinfo=None)
         credentials = Credentials(
             token=access_token,
             refresh_token=refresh_token,
-            token_uri=GoogleOAuthClient.TOKEN_URL,
-            client_id=self._google.client_id,
-            client_secret=self._google.client_secret,
-            scopes=list(self._oauth_settings.scopes),
+            token_uri=self._token_uri,
+            client_id=self._client_id,
+            client_secret=self._client_secret,
+            scopes=self._scopes_list,
+            expiry=expiry,
+        )
+        self._credentials_cache[user_id] = (
+            encrypted_access_token,
+            expires_at,
+            credentials,
+            now,
         )
-
         return credentials
 
+    def invalidate(self, user_id: str) -> None:
+        """Drop cached credentials so the next call re-reads the stored token.
+
+        Call after writing a new token record (e.g. an OAuth reconnect), which
+        would otherwise be hidden for up to ``_RECHECK_SECS``.
+        """
+        self._credentials_cache.pop(user_id, None)
+
+    def _should_refresh(self, expires_at: float, now: float) -> bool:
+        """Only refresh once the token is inside the expiry window."""
+        return expires_at - now <= self._REFRESH_SECS
+
+
+def _isoformat(timestamp: float) -> str:
+    """Render epoch seconds as the ISO 8601 text used for audit fields."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
 
 __all__ = ["GoogleTokenService"]
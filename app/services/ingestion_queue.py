@@ -0,0 +1,67 @@
+"""
+Service helpers for enqueuing trade ingestion jobs.
+"""
+
+from __future__ import annotations
+
+import secrets
+from datetime import datetime, timezone
+from typing import List
+
+from app.clients import SQLiteQueueClient
+from app.clients.sqlite_store import SQLiteStore
+from app.schemas import TradeAttachment, TradeIngestionRequest
+
+
+class IngestionQueueService:
+    """Queue trade ingestion jobs for the worker and track their lifecycle."""
+
+    __slots__ = ("_queue", "_store")
+
+    def __init__(self, queue_client: SQLiteQueueClient, store: SQLiteStore) -> None:
+        self._queue = queue_client
+        self._store = store
+
+    def enqueue_ingestion(
+        self,
+        *,
+        request: TradeIngestionRequest,
+        sheet_id: str,
+        sheet_range: str | None = None,
+        attachments: List[TradeAttachment] | None = None,
+    ) -> str:
+        """Record a pending trade ingestion job and hand it to the worker queue.
+
+        Attachments should reference staged uploads so the queued payload stays
+        small; see ``TradeIngestionService.stage_inline_attachments``.
+        """
+        # Several trades can arrive within a second, so add a random suffix.
+        job_id = f"{request.user_id}-{secrets.token_hex(8)}"
+        self._store.put_item(
+            {
+                "pk": f"user#{request.user_id}",
+                "sk": f"ingestion#{job_id}",
+                "status": "pending",
+                "requested_at": datetime.now(tz=timezone.utc),
+                "sheet_id": sheet_id,
+            }
+        )
+        self._queue.enqueue_ingestion_request(
+            {
+                "job_id": job_id,
+                # Top-level so the worker can find the job record even when the
+                # trade itself no longer validates.
+                "user_id": request.user_id,
+                "sheet_id": sheet_id,
+                "sheet_range": sheet_range,
+                "trade": request.model_dump(mode="json"),
+                "attachments": [
+                    attachment.model_dump(mode="json", exclude_none=True)
+                    for attachment in attachments or ()
+                ],
+            }
+        )
+        return job_id
+
+
+__all__ = ["IngestionQueueService"]
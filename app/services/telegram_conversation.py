@@ -49,7 +49,7 @@ class TelegramConversationalAssistant:
         inferred_fields: dict[str, object],
     ) -> str:
         history = session.conversation if session else []
-        known = {k: v for k, v in (result.trade.dict() if result.trade else {}).items() if v is not None}
+        known = {k: v for k, v in (result.trade.model_dump() if result.trade else {}).items() if v is not None}
         if inferred_fields:
             known.update({k: v for k, v in inferred_fields.items() if v})
 
@@ -3,35 +3,78 @@
 from __future__ import annotations
 
 import base64
+import binascii
 import hashlib
+import os
+from typing import Iterable
 
+import pybase64
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+_NONCE_SIZE = 12
+_AESGCM_KEY_INFO = b"trading-journal/token-cipher/aes-gcm-v1"
 
 
 class TokenCipherService:
-    """Encrypt and decrypt sensitive strings using a derived Fernet key."""
+    """Encrypt and decrypt sensitive strings with AES-GCM under a derived key.
+
+    Ciphertexts are ``urlsafe_b64(nonce || ciphertext || tag)``. The AES-GCM key
+    comes from HKDF over the secret; the SHA-256 digest earlier releases used
+    as the Fernet key is kept only to decrypt their tokens.
+    """
+
+    __slots__ = ("_seal", "_open", "_legacy_fernet")
 
     def __init__(self, *, secret: str) -> None:
         if not secret:
             raise ValueError("Token encryption secret must be provided.")
-        digest = hashlib.sha256(secret.encode("utf-8")).digest()
-        key = base64.urlsafe_b64encode(digest)
-        self._fernet = Fernet(key)
+        secret_bytes = secret.encode("utf-8")
+        aead_key = HKDF(
+            algorithm=hashes.SHA256(), length=32, salt=None, info=_AESGCM_KEY_INFO
+        ).derive(secret_bytes)
+        aead = AESGCM(aead_key)
+        # Bound once; encrypt/decrypt run for every stored token.
+        self._seal = aead.encrypt
+        self._open = aead.decrypt
+        legacy_key = hashlib.sha256(secret_bytes).digest()
+        self._legacy_fernet = Fernet(base64.urlsafe_b64encode(legacy_key))
+
+    def _encrypt(self, plaintext: str) -> str:
+        nonce = os.urandom(_NONCE_SIZE)
+        sealed = self._seal(nonce, plaintext.encode("utf-8"), None)
+        return pybase64.urlsafe_b64encode(nonce + sealed).decode("ascii")
 
     def encrypt(self, plaintext: str) -> str:
         """Encrypt a plaintext string and return the ciphertext."""
-        token = self._fernet.encrypt(plaintext.encode("utf-8"))
-        return token.decode("utf-8")
+        return self._encrypt(plaintext)
+
+    def encrypt_many(self, plaintexts: Iterable[str]) -> list[str]:
+        """Encrypt several plaintexts with the shared AES-GCM instance."""
+        encrypt = self._encrypt
+        return [encrypt(value) for value in plaintexts]
 
-    def decrypt(self, ciphertext: str) -> str:
-        """Decrypt a ciphertext string and return the plaintext."""
+    def decrypt(self, ciphertext: str | bytes) -> str:
+        """Decrypt a ciphertext (text or ASCII bytes) and return the plaintext."""
         try:
-            plaintext = self._fernet.decrypt(ciphertext.encode("utf-8"))
-        except InvalidToken as exc:  # pragma: no cover - defensive
+            # pybase64 takes the ASCII str as-is; no intermediate encode().
+            raw = pybase64.urlsafe_b64decode(ciphertext)
+            plaintext = self._open(raw[:_NONCE_SIZE], raw[_NONCE_SIZE:], None)
+        except (InvalidTag, binascii.Error, ValueError):
+            plaintext = self._decrypt_legacy(ciphertext)
+        return plaintext.decode("utf-8")
+
+    def _decrypt_legacy(self, ciphertext: str | bytes) -> bytes:
+        """Decrypt a Fernet token stored before the switch to AES-GCM."""
+        try:
+            return self._legacy_fernet.decrypt(ciphertext)
+        except InvalidToken as exc:
             raise ValueError(
                 "Failed to decrypt token; invalid ciphertext provided."
             ) from exc
-        return plaintext.decode("utf-8")
 
 
 __all__ = ["TokenCipherService"]
@@ -2,21 +2,64 @@
 
 from __future__ import annotations
 
-import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from time import monotonic
+from typing import Any, Dict, Iterator, List, Optional
 from uuid import uuid4
 
-from app.schemas import TradeAttachment, TradeIngestionRequest
+import orjson
+from pydantic import TypeAdapter
 
+from app.clients.sqlite_store import connect_wal
+from app.schemas import TradeAttachment, TradeIngestionRequest
 
-def _default_json_serializer(value: Any) -> Any:
-    if isinstance(value, datetime):
-        return value.isoformat()
-    raise TypeError(f"Type {type(value)!r} not serializable")
+_SESSION_COLUMNS = (
+    "session_id, user_id, structured, missing_fields, conversation, "
+    "attachments, trade, created_at, updated_at"
+)
+
+# Timestamps are stored as integer microseconds since the Unix epoch so TTL
+# comparisons are integer compares and reads skip ISO-8601 parsing.
+_CREATE_SESSIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS trade_capture_sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    structured TEXT,
+    missing_fields TEXT,
+    conversation TEXT,
+    attachments TEXT,
+    trade TEXT,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL
+)
+"""
+# Served by the partial index idx_sessions_user_updated created below.
+_ACTIVE_SESSION_QUERY = (
+    f"SELECT {_SESSION_COLUMNS} FROM trade_capture_sessions "
+    "WHERE user_id = ? AND missing_fields != '[]' "
+    "AND updated_at >= ? ORDER BY updated_at DESC LIMIT 1"
+)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Serializes the attachment list straight to JSON without per-item dicts.
+_ATTACHMENTS = TypeAdapter(List[TradeAttachment])
+
+
+def _to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _parse_legacy_timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
 
 
 def _ensure_directory(db_path: Path) -> None:
@@ -74,44 +117,105 @@ class TradeCaptureStore:
         self._db_path = Path(db_path)
         self._ttl = ttl_seconds
         _ensure_directory(self._db_path)
+        # One shared connection: WAL lets readers proceed during session writes,
+        # and connection setup no longer runs on every conversational turn.
+        self._conn = connect_wal(self._db_path)
+        self._conn.execute("PRAGMA cache_size=-64000")
+        self._conn.execute("PRAGMA wal_autocheckpoint=1000")
+        self._lock = threading.Lock()
+        # Expired rows are filtered out of every read, so the DELETE only needs
+        # to run now and then to reclaim space.
+        self._prune_interval = max(60, ttl_seconds // 10)
+        self._last_prune_monotonic = 0.0
         self._ensure_tables()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(
-            self._db_path,
-            detect_types=sqlite3.PARSE_DECLTYPES,
-            check_same_thread=False,
-        )
-        conn.row_factory = sqlite3.Row
-        return conn
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Serialize access to the shared connection inside one transaction."""
+        with self._lock, self._conn:
+            yield self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
 
     def _ensure_tables(self) -> None:
         with self._connect() as conn:
+            # DDL does not open an implicit transaction, so take the write lock
+            # up front: the schema check and a legacy rebuild commit as a unit.
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(_CREATE_SESSIONS_TABLE)
+            self._migrate_text_timestamps(conn)
             conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS trade_capture_sessions (
-                    session_id TEXT PRIMARY KEY,
-                    user_id TEXT NOT NULL,
-                    structured TEXT,
-                    missing_fields TEXT,
-                    conversation TEXT,
-                    attachments TEXT,
-                    trade TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-                """
+                "CREATE INDEX IF NOT EXISTS idx_sessions_updated_at "
+                "ON trade_capture_sessions(updated_at)"
+            )
+            # Partial index: only sessions still waiting on the user are looked
+            # up by user, newest first.
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_user_updated "
+                "ON trade_capture_sessions(user_id, updated_at DESC) "
+                "WHERE missing_fields != '[]'"
+            )
+
+    @staticmethod
+    def _migrate_text_timestamps(conn: sqlite3.Connection) -> None:
+        """Rebuild tables from older releases that stored ISO-8601 timestamps."""
+        columns = {
+            row["name"]: row["type"]
+            for row in conn.execute("PRAGMA table_info(trade_capture_sessions)")
+        }
+        if columns.get("updated_at", "").upper() != "TEXT":
+            return
+        # TEXT affinity would turn integers back into strings, so copy the rows.
+        conn.execute(
+            "ALTER TABLE trade_capture_sessions RENAME TO trade_capture_sessions_text"
+        )
+        conn.execute(_CREATE_SESSIONS_TABLE)
+        rows = [
+            (
+                row["session_id"],
+                row["user_id"],
+                row["structured"],
+                row["missing_fields"],
+                row["conversation"],
+                row["attachments"],
+                row["trade"],
+                _to_micros(_parse_legacy_timestamp(row["created_at"])),
+                _to_micros(_parse_legacy_timestamp(row["updated_at"])),
+            )
+            for row in conn.execute(
+                f"SELECT {_SESSION_COLUMNS} FROM trade_capture_sessions_text"
             )
+        ]
+        conn.executemany(
+            f"INSERT INTO trade_capture_sessions ({_SESSION_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.execute("DROP TABLE trade_capture_sessions_text")
+
+    def _expiry_threshold(self) -> int:
+        return _to_micros(datetime.now(timezone.utc) - timedelta(seconds=self._ttl))
+
+    def _prune_due(self) -> bool:
+        return monotonic() - self._last_prune_monotonic >= self._prune_interval
 
     def _prune(self) -> None:
-        threshold = (
-            datetime.now(timezone.utc) - timedelta(seconds=self._ttl)
-        ).isoformat()
+        if not self._prune_due():
+            return
         with self._connect() as conn:
-            conn.execute(
-                "DELETE FROM trade_capture_sessions WHERE updated_at < ?",
-                (threshold,),
-            )
+            self._prune_expired(conn)
+
+    def _prune_expired(self, conn: sqlite3.Connection) -> None:
+        # Callers hold the connection lock, so the re-check is race free.
+        if not self._prune_due():
+            return
+        self._last_prune_monotonic = monotonic()
+        conn.execute(
+            "DELETE FROM trade_capture_sessions WHERE updated_at < ?",
+            (self._expiry_threshold(),),
+        )
 
     def create(
         self,
@@ -140,8 +244,11 @@ class TradeCaptureStore:
         self._prune()
         with self._connect() as conn:
             row = conn.execute(
-                "SELECT * FROM trade_capture_sessions WHERE session_id = ?",
-                (session_id,),
+                (
+                    f"SELECT {_SESSION_COLUMNS} FROM trade_capture_sessions "
+                    "WHERE session_id = ? AND updated_at >= ?"
+                ),
+                (session_id, self._expiry_threshold()),
             ).fetchone()
         if not row:
             return None
@@ -152,18 +259,11 @@ class TradeCaptureStore:
         self._prune()
         with self._connect() as conn:
             row = conn.execute(
-                (
-                    "SELECT * FROM trade_capture_sessions "
-                    "WHERE user_id = ? ORDER BY updated_at DESC LIMIT 1"
-                ),
-                (user_id,),
+                _ACTIVE_SESSION_QUERY, (user_id, self._expiry_threshold())
             ).fetchone()
         if not row:
             return None
-        session = self._row_to_session(row)
-        if not session.missing_fields:
-            return None
-        return session
+        return self._row_to_session(row)
 
     def update(
         self,
@@ -175,17 +275,55 @@ class TradeCaptureStore:
         attachments: List[TradeAttachment],
         trade: TradeIngestionRequest | None = None,
     ) -> Optional[TradeCaptureSession]:
-        session = self.get(session_id)
-        if not session:
-            return None
-        session.append_message(message)
-        session.merge_structured(structured)
-        session.set_missing_fields(missing_fields)
-        session.extend_attachments(attachments)
-        session.set_trade(trade)
-        self._save_session(session)
+        return self.upsert(
+            session_id,
+            message=message,
+            structured=structured,
+            missing_fields=missing_fields,
+            attachments=attachments,
+            trade=trade,
+        )
+
+    def upsert(
+        self,
+        session_id: str,
+        *,
+        message: str,
+        structured: Dict[str, Any],
+        missing_fields: List[str],
+        attachments: List[TradeAttachment],
+        trade: TradeIngestionRequest | None = None,
+    ) -> Optional[TradeCaptureSession]:
+        """Merge updates into an existing session within a single transaction."""
+        with self._connect() as conn:
+            self._prune_expired(conn)
+            row = conn.execute(
+                (
+                    f"SELECT {_SESSION_COLUMNS} FROM trade_capture_sessions "
+                    "WHERE session_id = ? AND updated_at >= ?"
+                ),
+                (session_id, self._expiry_threshold()),
+            ).fetchone()
+            if not row:
+                return None
+            session = self._row_to_session(row)
+            session.append_message(message)
+            session.merge_structured(structured)
+            session.set_missing_fields(missing_fields)
+            session.extend_attachments(attachments)
+            session.set_trade(trade)
+            self._write_session(conn, session)
         return session
 
+    def finalize(self, session_id: str) -> None:
+        """Close a completed session and prune expired ones in one transaction."""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM trade_capture_sessions WHERE session_id = ?",
+                (session_id,),
+            )
+            self._prune_expired(conn)
+
     def delete(self, session_id: str) -> None:
         with self._connect() as conn:
             conn.execute(
@@ -194,69 +332,71 @@ class TradeCaptureStore:
             )
 
     def _save_session(self, session: TradeCaptureSession) -> None:
-        structured_json = json.dumps(
-            session.structured, default=_default_json_serializer
-        )
-        missing_json = json.dumps(session.missing_fields)
-        conversation_json = json.dumps(session.conversation)
-        attachments_json = json.dumps(
-            [attachment.dict() for attachment in session.attachments]
-        )
-        trade_json = json.dumps(session.trade.dict()) if session.trade else None
-
         with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO trade_capture_sessions (
-                    session_id,
-                    user_id,
-                    structured,
-                    missing_fields,
-                    conversation,
-                    attachments,
-                    trade,
-                    created_at,
-                    updated_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(session_id) DO UPDATE SET
-                    structured = excluded.structured,
-                    missing_fields = excluded.missing_fields,
-                    conversation = excluded.conversation,
-                    attachments = excluded.attachments,
-                    trade = excluded.trade,
-                    created_at = excluded.created_at,
-                    updated_at = excluded.updated_at
-                """,
-                (
-                    session.session_id,
-                    session.user_id,
-                    structured_json,
-                    missing_json,
-                    conversation_json,
-                    attachments_json,
-                    trade_json,
-                    session.created_at.isoformat(),
-                    session.updated_at.isoformat(),
-                ),
+            self._write_session(conn, session)
+
+    def _write_session(
+        self, conn: sqlite3.Connection, session: TradeCaptureSession
+    ) -> None:
+        # orjson writes datetimes in structured fields as ISO 8601 natively.
+        structured_json = orjson.dumps(session.structured).decode()
+        missing_json = orjson.dumps(session.missing_fields).decode()
+        conversation_json = orjson.dumps(session.conversation).decode()
+        attachments_json = _ATTACHMENTS.dump_json(session.attachments).decode()
+        trade_json = session.trade.model_dump_json() if session.trade else None
+
+        conn.execute(
+            """
+            INSERT INTO trade_capture_sessions (
+                session_id,
+                user_id,
+                structured,
+                missing_fields,
+                conversation,
+                attachments,
+                trade,
+                created_at,
+                updated_at
             )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(session_id) DO UPDATE SET
+                structured = excluded.structured,
+                missing_fields = excluded.missing_fields,
+                conversation = excluded.conversation,
+                attachments = excluded.attachments,
+                trade = excluded.trade,
+                created_at = excluded.created_at,
+                updated_at = excluded.updated_at
+            """,
+            (
+                session.session_id,
+                session.user_id,
+                structured_json,
+                missing_json,
+                conversation_json,
+                attachments_json,
+                trade_json,
+                _to_micros(session.created_at),
+                _to_micros(session.updated_at),
+            ),
+        )
 
     def _row_to_session(self, row: sqlite3.Row) -> TradeCaptureSession:
-        structured = json.loads(row["structured"]) if row["structured"] else {}
-        missing = json.loads(row["missing_fields"]) if row["missing_fields"] else []
+        structured = orjson.loads(row["structured"]) if row["structured"] else {}
+        missing = orjson.loads(row["missing_fields"]) if row["missing_fields"] else []
         conversation = (
-            json.loads(row["conversation"]) if row["conversation"] else []
+            orjson.loads(row["conversation"]) if row["conversation"] else []
         )
-        attachments_raw = (
-            json.loads(row["attachments"]) if row["attachments"] else []
+        attachments = (
+            _ATTACHMENTS.validate_json(row["attachments"])
+            if row["attachments"]
+            else []
         )
-        attachments = [TradeAttachment(**item) for item in attachments_raw]
         trade = None
         if row["trade"]:
-            trade_data = json.loads(row["trade"])
-            trade = TradeIngestionRequest.parse_obj(trade_data)
-        created_at = datetime.fromisoformat(row["created_at"])
-        updated_at = datetime.fromisoformat(row["updated_at"])
+            trade = TradeIngestionRequest.model_validate_json(row["trade"])
+        created_at = _EPOCH + timedelta(microseconds=row["created_at"])
+        updated_at = _EPOCH + timedelta(microseconds=row["updated_at"])
 
         session = TradeCaptureSession(
             session_id=row["session_id"],
@@ -4,11 +4,13 @@ Business logic for ingesting trades via the FastAPI agent.
 
 from __future__ import annotations
 
-import base64
+import asyncio
 import binascii
+import hmac
 from datetime import timezone
-from typing import List
+from typing import TYPE_CHECKING, List
 
+import pybase64
 from fastapi import HTTPException, status
 
 from app.clients import GoogleDriveClient, GoogleSheetsClient
@@ -19,20 +21,28 @@ from app.schemas import (
     TradeIngestionResponse,
 )
 
+if TYPE_CHECKING:
+    from app.clients.upload_store import SQLiteUploadStore
+
+ALLOWED_MIME_PREFIXES = ("image/", "audio/", "video/")
+MAX_ATTACHMENT_BYTES = 15 * 1024 * 1024  # 15 MB
+
 
 class TradeIngestionService:
     """Coordinate file uploads and sheet updates for trade entries."""
 
-    _ALLOWED_MIME_PREFIXES = ("image/", "audio/", "video/")
-    _MAX_ATTACHMENT_BYTES = 15 * 1024 * 1024  # 15 MB
+    _ALLOWED_MIME_PREFIXES = ALLOWED_MIME_PREFIXES
+    _MAX_ATTACHMENT_BYTES = MAX_ATTACHMENT_BYTES
 
     def __init__(
         self,
         drive_client: GoogleDriveClient,
         sheets_client: GoogleSheetsClient,
+        upload_store: SQLiteUploadStore | None = None,
     ) -> None:
         self._drive = drive_client
         self._sheets = sheets_client
+        self._uploads = upload_store
 
     async def ingest_trade(
         self,
@@ -45,27 +55,10 @@ class TradeIngestionService:
         """Persist trade entry and return summary metadata."""
         uploaded_files: List[TradeFileLink] = []
 
-        combined_attachments: List[TradeAttachment] = list(attachments or [])
-
-        if request.image_file_b64:
-            combined_attachments.append(
-                TradeAttachment(
-                    filename=f"{request.ticker}_setup.png",
-                    mime_type="image/png",
-                    file_b64=request.image_file_b64,
-                    tags=["setup", "image"],
-                )
-            )
-
-        if request.audio_file_b64:
-            combined_attachments.append(
-                TradeAttachment(
-                    filename=f"{request.ticker}_note.m4a",
-                    mime_type="audio/mp4",
-                    file_b64=request.audio_file_b64,
-                    tags=["note", "audio"],
-                )
-            )
+        combined_attachments: List[TradeAttachment] = [
+            *(attachments or []),
+            *self._inline_attachments(request),
+        ]
 
         for attachment in combined_attachments:
             uploaded_files.append(
@@ -89,6 +82,66 @@ class TradeIngestionService:
             sheet_row_id=row_id, uploaded_files=uploaded_files
         )
 
+    async def stage_inline_attachments(
+        self, request: TradeIngestionRequest
+    ) -> tuple[TradeIngestionRequest, List[TradeAttachment]]:
+        """Move inline base64 files into the upload store ahead of queueing.
+
+        Returns the trade without its base64 fields plus token attachments, so
+        queued jobs carry references instead of the file contents. Without an
+        upload store the request is returned unchanged.
+        """
+        inline = self._inline_attachments(request)
+        if self._uploads is None or not inline:
+            return request, []
+
+        staged: List[TradeAttachment] = []
+        for attachment in inline:
+            payload = self._decode_inline(attachment)
+            upload = await asyncio.to_thread(
+                self._uploads.put,
+                user_id=request.user_id,
+                mime_type=attachment.mime_type,
+                data=payload,
+            )
+            staged.append(
+                attachment.model_copy(
+                    update={
+                        "file_b64": None,
+                        "upload_token": upload.token,
+                        "content_sha256": upload.content_sha256,
+                    }
+                )
+            )
+        stripped = request.model_copy(
+            update={"image_file_b64": None, "audio_file_b64": None}
+        )
+        return stripped, staged
+
+    @staticmethod
+    def _inline_attachments(request: TradeIngestionRequest) -> List[TradeAttachment]:
+        """Wrap the request's inline image and audio fields as attachments."""
+        inline: List[TradeAttachment] = []
+        if request.image_file_b64:
+            inline.append(
+                TradeAttachment(
+                    filename=f"{request.ticker}_setup.png",
+                    mime_type="image/png",
+                    file_b64=request.image_file_b64,
+                    tags=["setup", "image"],
+                )
+            )
+        if request.audio_file_b64:
+            inline.append(
+                TradeAttachment(
+                    filename=f"{request.ticker}_note.m4a",
+                    mime_type="audio/mp4",
+                    file_b64=request.audio_file_b64,
+                    tags=["note", "audio"],
+                )
+            )
+        return inline
+
     async def _upload_attachment(
         self,
         *,
@@ -96,23 +149,6 @@ class TradeIngestionService:
         attachment: TradeAttachment,
     ) -> TradeFileLink:
         """Upload a trade attachment to Drive and return metadata."""
-        try:
-            payload = base64.b64decode(attachment.file_b64, validate=True)
-        except (ValueError, binascii.Error) as exc:  # pragma: no cover - defensive
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Attachment {attachment.filename} is not valid base64.",
-            ) from exc
-
-        if len(payload) > self._MAX_ATTACHMENT_BYTES:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=(
-                    f"Attachment {attachment.filename} exceeds "
-                    f"{self._MAX_ATTACHMENT_BYTES // (1024 * 1024)}MB limit."
-                ),
-            )
-
         if not attachment.mime_type.startswith(self._ALLOWED_MIME_PREFIXES):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -122,15 +158,84 @@ class TradeIngestionService:
                 ),
             )
 
-        metadata = await self._drive.upload_base64_file(
+        if attachment.upload_token is not None:
+            payload = await self._load_staged(user_id=user_id, attachment=attachment)
+        else:
+            payload = self._decode_inline(attachment)
+
+        metadata = await self._drive.upload_file_bytes(
             user_id=user_id,
             file_name=attachment.filename,
-            file_b64=attachment.file_b64,
+            file_bytes=payload,
             mime_type=attachment.mime_type,
             tags=attachment.tags,
         )
+        if attachment.upload_token is not None:
+            await asyncio.to_thread(self._uploads.delete, attachment.upload_token)
         return TradeFileLink(**metadata)
 
+    async def _load_staged(
+        self,
+        *,
+        user_id: str,
+        attachment: TradeAttachment,
+    ) -> bytes:
+        """Fetch pre-uploaded bytes by token and check them against the digest."""
+        staged = None
+        if self._uploads is not None:
+            staged = await asyncio.to_thread(
+                self._uploads.get, attachment.upload_token, user_id=user_id
+            )
+        if staged is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Attachment {attachment.filename} references an unknown or "
+                    "expired upload token."
+                ),
+            )
+        if attachment.content_sha256 and not hmac.compare_digest(
+            attachment.content_sha256.lower(), staged.content_sha256
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Attachment {attachment.filename} failed its SHA-256 check.",
+            )
+        # The MIME type was allow-listed when the bytes were staged; a different
+        # declared type would reach Drive unchecked.
+        if attachment.mime_type != staged.mime_type:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Attachment {attachment.filename} declares MIME type "
+                    f"{attachment.mime_type} but was uploaded as {staged.mime_type}."
+                ),
+            )
+        return staged.data
+
+    def _decode_inline(self, attachment: TradeAttachment) -> bytes:
+        """Decode a legacy inline base64 attachment after checking its size."""
+        # Size the payload from its base64 length (exact for the strict alphabet
+        # accepted below) so oversized uploads are rejected before decoding.
+        encoded = attachment.file_b64
+        decoded_size = len(encoded) // 4 * 3 - encoded[-2:].count("=")
+        if decoded_size > self._MAX_ATTACHMENT_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Attachment {attachment.filename} exceeds "
+                    f"{self._MAX_ATTACHMENT_BYTES // (1024 * 1024)}MB limit."
+                ),
+            )
+
+        try:
+            return pybase64.b64decode(encoded, validate=True)
+        except (ValueError, binascii.Error) as exc:  # pragma: no cover - defensive
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Attachment {attachment.filename} is not valid base64.",
+            ) from exc
+
     @staticmethod
     def _build_sheet_row(
         *,
@@ -157,4 +262,4 @@ class TradeIngestionService:
         ]
 
 
-__all__ = ["TradeIngestionService"]
+__all__ = ["ALLOWED_MIME_PREFIXES", "MAX_ATTACHMENT_BYTES", "TradeIngestionService"]
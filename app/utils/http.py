@@ -9,6 +9,9 @@ import httpx
 
 T = TypeVar("T")
 
+# Strong references; the event loop only keeps weak ones to its tasks.
+_LOOP_CLOSERS: set[asyncio.Task[None]] = set()
+
 
 class RetryConfig:
     def __init__(self, *, attempts: int = 3, backoff_seconds: float = 1.0) -> None:
@@ -46,4 +49,23 @@ async def request_with_retry(
     raise RuntimeError("Request failed without raising an exception")
 
 
-__all__ = ["RetryConfig", "request_with_retry"]
+def close_with_running_loop(client: httpx.AsyncClient) -> None:
+    """Close ``client`` on its own loop when that loop shuts down.
+
+    ``asyncio.run`` cancels leftover tasks before closing the loop, so a client
+    built per invocation releases its connections instead of leaking them
+    once a later loop replaces it.
+    """
+
+    async def _close_on_cancel() -> None:
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            await client.aclose()
+
+    task = asyncio.get_running_loop().create_task(_close_on_cancel())
+    _LOOP_CLOSERS.add(task)
+    task.add_done_callback(_LOOP_CLOSERS.discard)
+
+
+__all__ = ["RetryConfig", "close_with_running_loop", "request_with_retry"]
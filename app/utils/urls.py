@@ -0,0 +1,24 @@
+"""URL field types shared by schemas and settings.
+
+Kept apart from ``app.utils.http`` so importing a schema does not pull in httpx.
+"""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def _check_http_url(value: str) -> str:
+    if not value.startswith(("http://", "https://")):
+        raise ValueError("URL must start with http:// or https://")
+    return value
+
+
+# Plain-string URL field: a prefix check instead of a full URL parse, and the
+# value stays a str (no Url object or trailing-slash normalisation).
+HttpUrlStr = Annotated[str, AfterValidator(_check_http_url)]
+
+
+__all__ = ["HttpUrlStr"]
@@ -24,7 +24,7 @@ resource "aws_sqs_queue" "analysis_queue" {
   name                       = local.analysis_queue_name
   visibility_timeout_seconds = 900
   message_retention_seconds  = 1209600
-  receive_wait_time_seconds  = 10
+  receive_wait_time_seconds  = 20
 }
 
 resource "aws_dynamodb_table" "analysis_reports" {
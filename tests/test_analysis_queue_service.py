@@ -0,0 +1,64 @@
+try:
+    from . import _bootstrap  # noqa: F401
+except Exception:  # pragma: no cover - fallback for direct execution
+    import _bootstrap  # type: ignore # noqa: F401
+
+from datetime import datetime
+
+from app.clients.local_queue import SQLiteQueueClient
+from app.clients.sqlite_store import SQLiteStore
+from app.schemas import AnalysisRequest
+from app.services.analysis_queue import AnalysisQueueService
+
+
+def test_enqueue_analysis_uses_one_timestamp(tmp_path) -> None:
+    db_path = str(tmp_path / "queue.db")
+    store = SQLiteStore(db_path)
+    queue = SQLiteQueueClient(db_path)
+    service = AnalysisQueueService(queue_client=queue, store=store)
+
+    job_id = service.enqueue_analysis(
+        request=AnalysisRequest(user_id="user-1", sheet_id="sheet", prompt="Review")
+    )
+
+    payload = queue.dequeue_analysis_request()
+    record = store.get_item(partition_key="user#user-1", sort_key=f"analysis#{job_id}")
+    assert payload is not None and record is not None
+    assert payload["requested_at"] == record["requested_at"]
+    requested_at = datetime.fromisoformat(payload["requested_at"])
+    assert job_id.startswith(f"user-1-{int(requested_at.timestamp()):010d}-")
+
+
+def test_enqueue_analysis_ids_differ_within_one_second(tmp_path) -> None:
+    db_path = str(tmp_path / "queue.db")
+    service = AnalysisQueueService(
+        queue_client=SQLiteQueueClient(db_path), store=SQLiteStore(db_path)
+    )
+    request = AnalysisRequest(user_id="user-1", sheet_id="sheet", prompt="Review")
+
+    first = service.enqueue_analysis(request=request)
+    second = service.enqueue_analysis(request=request)
+
+    assert first != second
+
+
+def test_enqueue_many_records_and_queues_every_job(tmp_path) -> None:
+    db_path = str(tmp_path / "queue.db")
+    store = SQLiteStore(db_path)
+    queue = SQLiteQueueClient(db_path)
+    service = AnalysisQueueService(queue_client=queue, store=store)
+    requests = [
+        AnalysisRequest(user_id=f"user-{index}", sheet_id="sheet", prompt="Review")
+        for index in range(3)
+    ]
+
+    job_ids = service.enqueue_many(requests=requests)
+
+    assert len(set(job_ids)) == 3
+    queued = queue.receive_analysis_requests(max_messages=10, wait_time_seconds=0)
+    assert [payload["job_id"] for payload in queued] == job_ids
+    for index, job_id in enumerate(job_ids):
+        record = store.get_item(
+            partition_key=f"user#user-{index}", sort_key=f"analysis#{job_id}"
+        )
+        assert record is not None and record["status"] == "pending"
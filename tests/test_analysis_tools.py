@@ -136,3 +136,38 @@ async def test_collect_assets_and_transcribe_and_analyze() -> None:
         query="breakout strategy best practices"
     )
     assert research and research[0]["title"] == "Result"
+
+
+@pytest.mark.asyncio
+async def test_asset_downloads_are_bounded() -> None:
+    import asyncio
+
+    class TrackingDriveClient(StubDriveClient):
+        def __init__(self) -> None:
+            super().__init__({}, {})
+            self.active = 0
+            self.peak = 0
+
+        async def download_file_bytes(self, *, user_id: str, file_id: str) -> bytes:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0)
+            self.active -= 1
+            return b"bytes"
+
+    drive = TrackingDriveClient()
+    tools = AnalysisTools(
+        sheets_client=StubSheetsClient(),
+        drive_client=drive,
+        gemini_client=StubGeminiClient(),
+        max_concurrent_downloads=2,
+    )
+    assets = [{"file_id": f"file-{index}"} for index in range(6)]
+
+    audio, images = await asyncio.gather(
+        tools.transcribe_audio_assets(user_id="user-1", assets=assets),
+        tools.analyze_trade_images(user_id="user-1", assets=assets),
+    )
+
+    assert len(audio) == len(images) == 6
+    assert drive.peak == 2
@@ -0,0 +1,74 @@
+try:
+    from . import _bootstrap  # noqa: F401
+except Exception:  # pragma: no cover - fallback for direct execution
+    import _bootstrap  # type: ignore # noqa: F401
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.clients import gemini
+from app.clients.gemini import GeminiClient
+from app.core.config import GeminiSettings
+
+
+class LoopBoundModel:
+    """Fake model that, like grpc.aio, only works on the loop it first ran on."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    async def generate_content_async(self, content, **_: object):
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        if self.loop is not loop:
+            raise RuntimeError("attached to a different loop")
+        return SimpleNamespace(text=f"reply to {content}")
+
+
+@pytest.fixture()
+def client(monkeypatch) -> GeminiClient:
+    monkeypatch.setattr(gemini.genai, "GenerativeModel", LoopBoundModel)
+    monkeypatch.setattr(gemini.genai, "configure", lambda **_: None)
+    return GeminiClient(GeminiSettings(GEMINI_API_KEY="test-key"))
+
+
+def test_client_survives_consecutive_event_loops(client) -> None:
+    first = asyncio.run(client.generate_text("hello"))
+    second = asyncio.run(client.generate_text("again"))
+
+    assert first == "reply to hello"
+    assert second == "reply to again"
+
+
+def test_follower_recovers_when_leader_is_cancelled(client) -> None:
+    calls = 0
+
+    async def scenario() -> str:
+        release = asyncio.Event()
+
+        async def slow_call() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "shared"
+
+        leader = asyncio.create_task(client._deduplicated(b"key", slow_call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(client._deduplicated(b"key", slow_call))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await follower
+
+    assert asyncio.run(scenario()) == "shared"
+    assert calls == 2
+
+
+def test_serialize_section_stringifies_non_string_keys() -> None:
+    assert gemini._serialize_section([{1: "a"}]) == '[{"1":"a"}]'
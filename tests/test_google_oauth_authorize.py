@@ -37,6 +37,17 @@ class DummyCipher:
     def encrypt(self, value: str) -> str:
         return f"enc:{value}"
 
+    def encrypt_many(self, values: list[str]) -> list[str]:
+        return [self.encrypt(value) for value in values]
+
+
+class DummyTokenService:
+    def __init__(self) -> None:
+        self.invalidated: list[str] = []
+
+    def invalidate(self, user_id: str) -> None:
+        self.invalidated.append(user_id)
+
 
 @pytest.fixture()
 def oauth_overrides():
@@ -46,6 +57,7 @@ def oauth_overrides():
     dummy_client = DummyOAuthClient()
     dummy_store = DummyStore()
     dummy_cipher = DummyCipher()
+    dummy_token_service = DummyTokenService()
     base_settings = copy.deepcopy(get_settings())
     base_settings.frontend_base_url = None
 
@@ -53,6 +65,7 @@ def oauth_overrides():
         dependencies.get_google_oauth_client: lambda: dummy_client,
         dependencies.get_sqlite_store: lambda: dummy_store,
         dependencies.get_token_cipher_service: lambda: dummy_cipher,
+        dependencies.get_google_token_service: lambda: dummy_token_service,
         dependencies.get_app_settings: lambda: base_settings,
     }
 
@@ -100,6 +113,8 @@ async def test_authorize_redirects_for_html_accept(oauth_overrides):
 
 @pytest.mark.anyio
 async def test_callback_get_returns_json_when_no_frontend(oauth_overrides):
+    from app import dependencies
+
     dummy_client, dummy_store, _ = oauth_overrides
 
     async with httpx.AsyncClient(
@@ -121,6 +136,8 @@ async def test_callback_get_returns_json_when_no_frontend(oauth_overrides):
     assert data["status"] == "connected"
     assert dummy_client.codes[-1] == "oauth-code"
     assert dummy_store.items
+    token_service = app.dependency_overrides[dependencies.get_google_token_service]()
+    assert token_service.invalidated == ["user-1"]
 
 
 @pytest.mark.anyio
@@ -148,3 +165,23 @@ async def test_callback_get_redirects_when_frontend_available(oauth_overrides):
         callback_resp.headers["location"]
         == "https://app.example.com/oauth/success"
     )
+
+
+def test_oauth_http_client_closes_with_its_event_loop() -> None:
+    import asyncio
+
+    from app.clients.google_auth import GoogleOAuthClient
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    client = GoogleOAuthClient(settings.google, settings.oauth)
+
+    async def grab_http_client():
+        return client._http()
+
+    first = asyncio.run(grab_http_client())
+    second = asyncio.run(grab_http_client())
+
+    assert first is not second
+    assert first.is_closed
+    assert second.is_closed
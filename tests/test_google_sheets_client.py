@@ -0,0 +1,27 @@
+try:
+    from . import _bootstrap  # noqa: F401
+except Exception:  # pragma: no cover - fallback for direct execution
+    import _bootstrap  # type: ignore # noqa: F401
+
+from app.clients.google_sheets import _rows_to_dicts
+
+
+def test_rows_to_dicts_pads_short_rows_and_drops_extra_cells() -> None:
+    rows = _rows_to_dicts(["ticker", "pnl"], [["AAPL"], ["NVDA", 5, "extra"]])
+
+    assert rows == [
+        {"ticker": "AAPL", "pnl": None},
+        {"ticker": "NVDA", "pnl": 5},
+    ]
+
+
+def test_rows_to_dicts_skips_empty_headers() -> None:
+    rows = _rows_to_dicts(
+        ["ticker", "", "pnl"], [["AAPL", "ignored", 10], ["NVDA"], ["TSLA", "x", 3, 9]]
+    )
+
+    assert rows == [
+        {"ticker": "AAPL", "pnl": 10},
+        {"ticker": "NVDA", "pnl": None},
+        {"ticker": "TSLA", "pnl": 3},
+    ]
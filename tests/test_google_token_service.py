@@ -80,6 +80,7 @@ async def test_get_credentials_refreshes_and_updates_storage() -> None:
     assert (
         cipher.decrypt(stored["access_token_encrypted"]) == oauth_client.refreshed_token
     )
+    assert isinstance(stored["expires_at"], float)
     assert stored.get("updated_at") is not None
 
 
@@ -125,3 +126,203 @@ async def test_get_credentials_migrates_plaintext_tokens() -> None:
     assert stored["access_token_encrypted"] != "legacy-access"
     assert stored["refresh_token_encrypted"] != "legacy-refresh"
     assert stored.get("updated_at") is not None
+
+
+@pytest.mark.asyncio
+async def test_get_credentials_reuses_valid_credentials_without_refresh() -> None:
+    dynamo = FakeStore()
+    cipher = TokenCipherService(secret="secret-key")
+    oauth_client = DummyOAuthClient()
+
+    settings = GoogleSettings(
+        client_id="client",
+        client_secret="secret",
+        redirect_uri="https://example.com/callback",
+    )
+
+    expires_at = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+    dynamo.put_item(
+        {
+            "pk": "user#456",
+            "sk": "oauth#google",
+            "access_token_encrypted": cipher.encrypt("valid-token"),
+            "refresh_token_encrypted": cipher.encrypt("refresh-token"),
+            "expires_at": expires_at,
+        }
+    )
+
+    service = GoogleTokenService(
+        store=dynamo,
+        oauth_client=oauth_client,
+        google_settings=settings,
+        oauth_settings=OAuthSettings(),
+        token_cipher=cipher,
+    )
+
+    first = await service.get_credentials(user_id="456")
+    second = await service.get_credentials(user_id="456")
+
+    assert first.token == "valid-token"
+    assert second is first
+    assert oauth_client.calls == []
+
+
+@pytest.mark.asyncio
+async def test_get_credentials_migrates_iso_expiry_to_epoch_seconds() -> None:
+    dynamo = FakeStore()
+    cipher = TokenCipherService(secret="secret-key")
+    oauth_client = DummyOAuthClient()
+
+    expires_at_dt = datetime.now(timezone.utc) + timedelta(hours=1)
+    dynamo.put_item(
+        {
+            "pk": "user#789",
+            "sk": "oauth#google",
+            "access_token_encrypted": cipher.encrypt("valid-token"),
+            "refresh_token_encrypted": cipher.encrypt("refresh-token"),
+            "expires_at": expires_at_dt.isoformat(),
+        }
+    )
+
+    service = GoogleTokenService(
+        store=dynamo,
+        oauth_client=oauth_client,
+        google_settings=GoogleSettings(
+            client_id="client",
+            client_secret="secret",
+            redirect_uri="https://example.com/callback",
+        ),
+        oauth_settings=OAuthSettings(),
+        token_cipher=cipher,
+    )
+
+    credentials = await service.get_credentials(user_id="789")
+
+    stored = dynamo.get_item(partition_key="user#789", sort_key="oauth#google")
+    assert stored["expires_at"] == expires_at_dt.timestamp()
+    assert credentials.token == "valid-token"
+    assert oauth_client.calls == []
+
+
+@pytest.mark.asyncio
+async def test_get_credentials_serves_recent_cache_without_store_read() -> None:
+    dynamo = FakeStore()
+    cipher = TokenCipherService(secret="secret-key")
+    oauth_client = DummyOAuthClient()
+
+    dynamo.put_item(
+        {
+            "pk": "user#321",
+            "sk": "oauth#google",
+            "access_token_encrypted": cipher.encrypt("valid-token"),
+            "refresh_token_encrypted": cipher.encrypt("refresh-token"),
+            "expires_at": datetime.now(timezone.utc).timestamp() + 3600,
+        }
+    )
+
+    service = GoogleTokenService(
+        store=dynamo,
+        oauth_client=oauth_client,
+        google_settings=GoogleSettings(
+            client_id="client",
+            client_secret="secret",
+            redirect_uri="https://example.com/callback",
+        ),
+        oauth_settings=OAuthSettings(),
+        token_cipher=cipher,
+    )
+
+    first = await service.get_credentials(user_id="321")
+    dynamo._storage.clear()
+    second = await service.get_credentials(user_id="321")
+
+    assert second is first
+    assert oauth_client.calls == []
+
+
+@pytest.mark.asyncio
+async def test_get_credentials_writes_migration_and_refresh_once() -> None:
+    class CountingStore(FakeStore):
+        def __init__(self) -> None:
+            super().__init__()
+            self.writes = 0
+
+        def put_item(self, item: dict) -> None:
+            self.writes += 1
+            super().put_item(item)
+
+    dynamo = CountingStore()
+    cipher = TokenCipherService(secret="secret-key")
+    oauth_client = DummyOAuthClient()
+
+    dynamo.put_item(
+        {
+            "pk": "user#654",
+            "sk": "oauth#google",
+            "access_token": "legacy-access",
+            "refresh_token": "legacy-refresh",
+            "expires_at": datetime.now(timezone.utc).timestamp() - 60,
+        }
+    )
+    dynamo.writes = 0
+
+    service = GoogleTokenService(
+        store=dynamo,
+        oauth_client=oauth_client,
+        google_settings=GoogleSettings(
+            client_id="client",
+            client_secret="secret",
+            redirect_uri="https://example.com/callback",
+        ),
+        oauth_settings=OAuthSettings(),
+        token_cipher=cipher,
+    )
+
+    credentials = await service.get_credentials(user_id="654")
+
+    assert credentials.token == oauth_client.refreshed_token
+    assert oauth_client.calls == ["legacy-refresh"]
+    assert dynamo.writes == 1
+    stored = dynamo.get_item(partition_key="user#654", sort_key="oauth#google")
+    assert "access_token" not in stored
+
+
+@pytest.mark.asyncio
+async def test_get_credentials_after_reconnect_and_invalidate() -> None:
+    dynamo = FakeStore()
+    cipher = TokenCipherService(secret="secret-key")
+    oauth_client = DummyOAuthClient()
+
+    def store_tokens(access_token: str) -> None:
+        dynamo.put_item(
+            {
+                "pk": "user#321",
+                "sk": "oauth#google",
+                "access_token_encrypted": cipher.encrypt(access_token),
+                "refresh_token_encrypted": cipher.encrypt("refresh-token"),
+                "expires_at": datetime.now(timezone.utc).timestamp() + 3600,
+            }
+        )
+
+    store_tokens("old-token")
+    service = GoogleTokenService(
+        store=dynamo,
+        oauth_client=oauth_client,
+        google_settings=GoogleSettings(
+            client_id="client",
+            client_secret="secret",
+            redirect_uri="https://example.com/callback",
+        ),
+        oauth_settings=OAuthSettings(),
+        token_cipher=cipher,
+    )
+    first = await service.get_credentials(user_id="321")
+
+    # What the OAuth callback does on reconnect.
+    store_tokens("new-token")
+    service.invalidate("321")
+    second = await service.get_credentials(user_id="321")
+
+    assert first.token == "old-token"
+    assert second.token == "new-token"
+    assert oauth_client.calls == []
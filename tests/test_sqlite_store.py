@@ -0,0 +1,138 @@
+try:
+    from . import _bootstrap  # noqa: F401
+except Exception:  # pragma: no cover - fallback for direct execution
+    import _bootstrap  # type: ignore # noqa: F401
+
+import threading
+
+import pytest
+
+from app.clients.sqlite_store import SQLiteStore
+
+
+class _WriteOnCacheFillLock:
+    """Item-cache lock that races one ``put_item`` against the reader's fill.
+
+    The second acquisition in a read is the cache fill; before taking the lock
+    it gives a concurrent writer a chance to commit and invalidate.
+    """
+
+    def __init__(self, store: SQLiteStore, item: dict) -> None:
+        self._lock = threading.Lock()
+        self._store = store
+        self._item = item
+        self._acquisitions = 0
+        self.writer: threading.Thread | None = None
+
+    def __enter__(self) -> None:
+        self._acquisitions += 1
+        if self._acquisitions == 2:
+            self.writer = threading.Thread(
+                target=self._store.put_item, args=(self._item,)
+            )
+            self.writer.start()
+            self.writer.join(timeout=0.5)
+        self._lock.acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        self._lock.release()
+
+
+def test_get_item_reflects_latest_put(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "store.db"))
+    store.put_item({"pk": "job#1", "sk": "status", "status": "pending"})
+    assert store.get_item(partition_key="job#1", sort_key="status")["status"] == (
+        "pending"
+    )
+
+    store.put_item({"pk": "job#1", "sk": "status", "status": "completed"})
+
+    item = store.get_item(partition_key="job#1", sort_key="status")
+    assert item["status"] == "completed"
+
+
+def test_cached_items_are_not_shared_between_callers(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "store.db"))
+    store.put_item({"pk": "job#2", "sk": "status", "status": "pending"})
+
+    first = store.get_item(partition_key="job#2", sort_key="status")
+    first["status"] = "mutated"
+
+    second = store.get_item(partition_key="job#2", sort_key="status")
+    assert second["status"] == "pending"
+
+
+def test_delete_item_evicts_cached_entry(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "store.db"))
+    store.put_item({"pk": "job#3", "sk": "status", "status": "pending"})
+    store.get_item(partition_key="job#3", sort_key="status")
+
+    store.delete_item(partition_key="job#3", sort_key="status")
+
+    assert store.get_item(partition_key="job#3", sort_key="status") is None
+
+
+def test_batch_get_items_returns_found_items_in_key_order(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "store.db"))
+    for index in range(3):
+        store.put_item({"pk": "user#1", "sk": f"analysis#{index}", "index": index})
+
+    items = store.batch_get_items(
+        [
+            {"pk": "user#1", "sk": "analysis#2"},
+            {"pk": "user#1", "sk": "analysis#missing"},
+            {"pk": "user#1", "sk": "analysis#0"},
+        ]
+    )
+
+    assert [item["index"] for item in items] == [2, 0]
+
+
+def test_list_items_with_prefix_matches_literal_prefix_only(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "store.db"))
+    for sort_key in ("analysis#1", "analysis#2", "Analysis#3", "analysisX", "oauth"):
+        store.put_item({"pk": "user#1", "sk": sort_key})
+
+    items = store.list_items_with_prefix(
+        partition_key="user#1", sort_key_prefix="analysis#"
+    )
+
+    assert sorted(item["sk"] for item in items) == ["analysis#1", "analysis#2"]
+
+
+def test_put_items_upserts_all_items(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "store.db"))
+    store.put_item({"pk": "user#1", "sk": "trade#1", "pnl": 1})
+
+    store.put_items(
+        [
+            {"pk": "user#1", "sk": "trade#1", "pnl": 10},
+            {"pk": "user#1", "sk": "trade#2", "pnl": 20},
+        ]
+    )
+
+    items = store.list_items_with_prefix(
+        partition_key="user#1", sort_key_prefix="trade#"
+    )
+    assert sorted(item["pnl"] for item in items) == [10, 20]
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_concurrent_put_during_read_does_not_leave_stale_cache(
+    tmp_path, batched
+) -> None:
+    store = SQLiteStore(str(tmp_path / "store.db"))
+    store.put_item({"pk": "job#1", "sk": "status", "status": "pending"})
+    racing_lock = _WriteOnCacheFillLock(
+        store, {"pk": "job#1", "sk": "status", "status": "completed"}
+    )
+    store._item_cache_lock = racing_lock
+
+    if batched:
+        store.batch_get_items([{"pk": "job#1", "sk": "status"}])
+    else:
+        store.get_item(partition_key="job#1", sort_key="status")
+    racing_lock.writer.join()
+
+    item = store.get_item(partition_key="job#1", sort_key="status")
+    assert item["status"] == "completed"
@@ -3,7 +3,13 @@ try:
 except Exception:  # pragma: no cover - fallback for direct execution
     import _bootstrap  # type: ignore # noqa: F401
 
+import base64
+import hashlib
+
 import pytest
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from app.services.token_cipher import TokenCipherService
 
@@ -17,6 +23,7 @@ def test_token_cipher_roundtrip() -> None:
 
     decrypted = cipher.decrypt(encrypted)
     assert decrypted == plaintext
+    assert cipher.decrypt(encrypted.encode("ascii")) == plaintext
 
 
 def test_token_cipher_rejects_bad_ciphertext() -> None:
@@ -24,3 +31,30 @@ def test_token_cipher_rejects_bad_ciphertext() -> None:
 
     with pytest.raises(ValueError):
         cipher.decrypt("not-valid")
+
+
+def test_token_cipher_encrypt_many_roundtrip() -> None:
+    cipher = TokenCipherService(secret="batch-secret")
+
+    encrypted = cipher.encrypt_many(["access", "refresh"])
+
+    assert len(encrypted) == 2
+    assert [cipher.decrypt(value) for value in encrypted] == ["access", "refresh"]
+
+
+def test_token_cipher_decrypts_legacy_fernet_tokens() -> None:
+    secret = "legacy-secret"
+    key = base64.urlsafe_b64encode(hashlib.sha256(secret.encode("utf-8")).digest())
+    legacy = Fernet(key).encrypt(b"old-token").decode("utf-8")
+
+    assert TokenCipherService(secret=secret).decrypt(legacy) == "old-token"
+
+
+def test_token_cipher_does_not_reuse_fernet_key_for_aes_gcm() -> None:
+    secret = "separated-secret"
+    encrypted = TokenCipherService(secret=secret).encrypt("token")
+    raw = base64.urlsafe_b64decode(encrypted)
+    digest_key = AESGCM(hashlib.sha256(secret.encode("utf-8")).digest())
+
+    with pytest.raises(InvalidTag):
+        digest_key.decrypt(raw[:12], raw[12:], None)
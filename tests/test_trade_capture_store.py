@@ -0,0 +1,220 @@
+try:
+    from . import _bootstrap  # noqa: F401
+except Exception:  # pragma: no cover - fallback for direct execution
+    import _bootstrap  # type: ignore # noqa: F401
+
+from app.schemas import TradeAttachment
+from app.services.trade_capture import _ACTIVE_SESSION_QUERY, TradeCaptureStore
+
+
+def _build_store(tmp_path) -> TradeCaptureStore:
+    return TradeCaptureStore(db_path=str(tmp_path / "capture.db"), ttl_seconds=60)
+
+
+def test_upsert_merges_into_existing_session(tmp_path) -> None:
+    store = _build_store(tmp_path)
+    session = store.create(
+        user_id="user-1",
+        initial_message="Long NVDA",
+        structured={"ticker": "NVDA"},
+        missing_fields=["pnl", "exit_timestamp"],
+        attachments=[],
+    )
+
+    updated = store.upsert(
+        session.session_id,
+        message="Made 150",
+        structured={"pnl": 150.0},
+        missing_fields=["exit_timestamp"],
+        attachments=[],
+    )
+
+    assert updated is not None
+    reloaded = store.get(session.session_id)
+    assert reloaded.structured == {"ticker": "NVDA", "pnl": 150.0}
+    assert reloaded.missing_fields == ["exit_timestamp"]
+    assert reloaded.conversation == ["Long NVDA", "Made 150"]
+
+
+def test_upsert_returns_none_for_unknown_session(tmp_path) -> None:
+    store = _build_store(tmp_path)
+
+    result = store.upsert(
+        "missing",
+        message="hello",
+        structured={},
+        missing_fields=[],
+        attachments=[],
+    )
+
+    assert result is None
+
+
+def test_finalize_removes_session(tmp_path) -> None:
+    store = _build_store(tmp_path)
+    session = store.create(
+        user_id="user-2",
+        initial_message="Short TSLA",
+        structured={},
+        missing_fields=["pnl"],
+        attachments=[],
+    )
+
+    store.finalize(session.session_id)
+
+    assert store.get(session.session_id) is None
+
+
+def test_store_uses_wal_journal(tmp_path) -> None:
+    import sqlite3
+
+    _build_store(tmp_path)
+
+    conn = sqlite3.connect(tmp_path / "capture.db")
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        conn.close()
+
+
+def test_attachments_round_trip(tmp_path) -> None:
+    store = _build_store(tmp_path)
+    attachment = TradeAttachment(
+        filename="chart.png",
+        mime_type="image/png",
+        upload_token="token-1",
+        content_sha256="ab" * 32,
+        tags=["setup"],
+    )
+    session = store.create(
+        user_id="user-3",
+        initial_message="Long AAPL",
+        structured={},
+        missing_fields=["pnl"],
+        attachments=[attachment],
+    )
+
+    reloaded = store.get(session.session_id)
+
+    assert reloaded.attachments == [attachment]
+
+
+def test_expired_session_is_hidden_before_prune_runs(tmp_path) -> None:
+    from datetime import datetime, timedelta, timezone
+
+    store = _build_store(tmp_path)
+    session = store.create(
+        user_id="user-4",
+        initial_message="Long MSFT",
+        structured={},
+        missing_fields=["pnl"],
+        attachments=[],
+    )
+    session.updated_at = datetime.now(timezone.utc) - timedelta(seconds=120)
+    store._save_session(session)
+
+    assert store.get(session.session_id) is None
+    assert store.get_active_for_user("user-4") is None
+
+
+def test_active_session_lookup_uses_partial_index(tmp_path) -> None:
+    store = _build_store(tmp_path)
+    pending = store.create(
+        user_id="user-5",
+        initial_message="Long AMD",
+        structured={},
+        missing_fields=["pnl"],
+        attachments=[],
+    )
+    store.create(
+        user_id="user-5",
+        initial_message="Short AMD",
+        structured={},
+        missing_fields=[],
+        attachments=[],
+    )
+
+    active = store.get_active_for_user("user-5")
+    with store._connect() as conn:
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                f"EXPLAIN QUERY PLAN {_ACTIVE_SESSION_QUERY}", ("user-5", 0)
+            )
+        )
+
+    assert active is not None and active.session_id == pending.session_id
+    assert "idx_sessions_user_updated" in plan
+
+
+def _write_legacy_session(db_path, timestamp: str) -> None:
+    import sqlite3
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        CREATE TABLE trade_capture_sessions (
+            session_id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            structured TEXT,
+            missing_fields TEXT,
+            conversation TEXT,
+            attachments TEXT,
+            trade TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        "INSERT INTO trade_capture_sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ("legacy", "user-6", "{}", '["pnl"]', "[]", "[]", None, timestamp, timestamp),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_legacy_text_timestamps_are_migrated(tmp_path) -> None:
+    from datetime import datetime, timezone
+
+    now = datetime.now(timezone.utc).replace(microsecond=123456)
+    _write_legacy_session(tmp_path / "capture.db", now.isoformat())
+
+    store = _build_store(tmp_path)
+    session = store.get("legacy")
+
+    assert session is not None
+    assert session.updated_at == now
+    with store._connect() as conn:
+        stored = conn.execute(
+            "SELECT typeof(updated_at) FROM trade_capture_sessions"
+        ).fetchone()[0]
+    assert stored == "integer"
+
+
+def test_failed_legacy_migration_leaves_table_untouched(tmp_path) -> None:
+    import sqlite3
+
+    import pytest
+
+    db_path = tmp_path / "capture.db"
+    _write_legacy_session(db_path, "not-a-timestamp")
+
+    with pytest.raises(ValueError):
+        _build_store(tmp_path)
+
+    conn = sqlite3.connect(db_path)
+    tables = [
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    ]
+    columns = {
+        row[1]: row[2]
+        for row in conn.execute("PRAGMA table_info(trade_capture_sessions)")
+    }
+    rows = conn.execute("SELECT session_id FROM trade_capture_sessions").fetchall()
+    conn.close()
+
+    assert tables == ["trade_capture_sessions"]
+    assert columns["updated_at"] == "TEXT"
+    assert rows == [("legacy",)]
@@ -0,0 +1,221 @@
+try:
+    from . import _bootstrap  # noqa: F401
+except Exception:  # pragma: no cover - fallback for direct execution
+    import _bootstrap  # type: ignore # noqa: F401
+
+import httpx
+import pytest
+
+from app.main import app
+from app.schemas import TradeIngestionRequest, TradeIngestionResponse
+
+
+class StubTokenService:
+    async def get_credentials(self, *, user_id: str):  # pragma: no cover - simple stub
+        return True
+
+
+class RecordingIngestionService:
+    def __init__(self) -> None:
+        self.requests: list[TradeIngestionRequest] = []
+
+    async def ingest_trade(
+        self,
+        *,
+        request: TradeIngestionRequest,
+        sheet_id: str,
+        sheet_range: str | None = None,
+        attachments=None,
+    ) -> TradeIngestionResponse:
+        self.requests.append(request)
+        return TradeIngestionResponse(sheet_row_id="row-1", uploaded_files=[])
+
+    async def stage_inline_attachments(self, request: TradeIngestionRequest):
+        return request, []
+
+
+class RecordingQueueService:
+    def __init__(self) -> None:
+        self.ingestions: list[dict] = []
+
+    def enqueue_ingestion(
+        self,
+        *,
+        request: TradeIngestionRequest,
+        sheet_id: str,
+        sheet_range: str | None = None,
+        attachments=None,
+    ) -> str:
+        self.ingestions.append(
+            {"request": request, "sheet_id": sheet_id, "sheet_range": sheet_range}
+        )
+        return "job-123"
+
+
+pytestmark = pytest.mark.anyio("asyncio")
+
+TRADE_PAYLOAD = {
+    "user_id": "user-1",
+    "ticker": "NVDA",
+    "pnl": 420.0,
+    "position_type": "long",
+    "entry_timestamp": "2025-11-01T09:30:00+00:00",
+    "exit_timestamp": "2025-11-01T15:45:00+00:00",
+}
+
+
+@pytest.fixture()
+def overrides():
+    from app import dependencies
+
+    ingestion = RecordingIngestionService()
+    queue = RecordingQueueService()
+
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(
+        {
+            dependencies.get_google_token_service: lambda: StubTokenService(),
+            dependencies.get_trade_ingestion_service: lambda: ingestion,
+            dependencies.get_ingestion_queue_service: lambda: queue,
+        }
+    )
+
+    yield ingestion, queue
+
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+async def client(overrides):
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://testserver",
+    ) as test_client:
+        yield test_client
+
+
+async def test_ingest_trade_queues_job_and_returns_accepted(overrides, client):
+    ingestion, queue = overrides
+
+    response = await client.post(
+        "/api/trades",
+        params={"sheet_id": "sheet-1", "sheet_range": "Journal!A1"},
+        json=TRADE_PAYLOAD,
+    )
+
+    assert response.status_code == 202
+    assert response.json() == {"status": "accepted", "job_id": "job-123"}
+    assert ingestion.requests == []
+    assert queue.ingestions[0]["sheet_id"] == "sheet-1"
+    assert queue.ingestions[0]["sheet_range"] == "Journal!A1"
+    assert queue.ingestions[0]["request"].ticker == "NVDA"
+
+
+async def test_ingest_trade_sync_flag_ingests_inline(overrides, client):
+    ingestion, queue = overrides
+
+    response = await client.post(
+        "/api/trades",
+        params={"sheet_id": "sheet-1", "sync": "true"},
+        json=TRADE_PAYLOAD,
+    )
+
+    assert response.status_code == 201
+    assert response.json()["sheet_row_id"] == "row-1"
+    assert len(ingestion.requests) == 1
+    assert queue.ingestions == []
+
+
+async def test_ingest_trade_accepts_camel_case_keys(overrides, client):
+    _, queue = overrides
+    camel_payload = {
+        "userId": "user-1",
+        "ticker": "NVDA",
+        "pnl": 420.0,
+        "positionType": "long",
+        "entryTimestamp": "2025-11-01T09:30:00+00:00",
+        "exitTimestamp": "2025-11-01T15:45:00+00:00",
+    }
+
+    response = await client.post(
+        "/api/trades", params={"sheet_id": "sheet-1"}, json=camel_payload
+    )
+
+    assert response.status_code == 202
+    request = queue.ingestions[0]["request"]
+    assert request.user_id == "user-1"
+    assert request.position_type == "long"
+
+
+async def test_upload_attachment_returns_token(client, tmp_path):
+    from app import dependencies
+    from app.clients.upload_store import SQLiteUploadStore
+
+    uploads = SQLiteUploadStore(str(tmp_path / "uploads.db"))
+    app.dependency_overrides[dependencies.get_upload_store] = lambda: uploads
+
+    response = await client.post(
+        "/api/attachments",
+        params={"user_id": "user-1"},
+        content=b"png-bytes",
+        headers={"Content-Type": "image/png"},
+    )
+    rejected = await client.post(
+        "/api/attachments",
+        params={"user_id": "user-1"},
+        content=b"%PDF",
+        headers={"Content-Type": "application/pdf"},
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["size_bytes"] == len(b"png-bytes")
+    staged = uploads.get(body["upload_token"], user_id="user-1")
+    assert staged is not None and staged.data == b"png-bytes"
+    assert staged.content_sha256 == body["content_sha256"]
+    assert rejected.status_code == 415
+
+
+async def test_trade_ingestion_status_returns_job_record(client, tmp_path):
+    from app import dependencies
+    from app.clients.sqlite_store import SQLiteStore
+
+    store = SQLiteStore(str(tmp_path / "jobs.db"))
+    store.put_item(
+        {"pk": "user#user-1", "sk": "ingestion#job-123", "status": "completed"}
+    )
+    app.dependency_overrides[dependencies.get_sqlite_store] = lambda: store
+
+    response = await client.get(
+        "/api/trades/jobs/job-123", params={"user_id": "user-1"}
+    )
+    missing = await client.get(
+        "/api/trades/jobs/job-404", params={"user_id": "user-1"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert missing.status_code == 404
+
+
+async def test_analysis_job_statuses_batches_lookup_and_caps_ids(client, tmp_path):
+    from app import dependencies
+    from app.clients.sqlite_store import SQLiteStore
+
+    store = SQLiteStore(str(tmp_path / "jobs.db"))
+    store.put_item({"pk": "user#user-1", "sk": "analysis#job-1", "status": "pending"})
+    store.put_item({"pk": "user#user-1", "sk": "analysis#job-2", "status": "done"})
+    app.dependency_overrides[dependencies.get_sqlite_store] = lambda: store
+
+    response = await client.get(
+        "/api/analysis/jobs",
+        params={"user_id": "user-1", "job_id": ["job-2", "missing", "job-1"]},
+    )
+    too_many = await client.get(
+        "/api/analysis/jobs",
+        params={"user_id": "user-1", "job_id": [f"job-{i}" for i in range(101)]},
+    )
+
+    assert response.status_code == 200
+    assert [job["status"] for job in response.json()["jobs"]] == ["done", "pending"]
+    assert too_many.status_code == 422
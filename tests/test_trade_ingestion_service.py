@@ -7,8 +7,13 @@ import base64
 
 import pytest
 from fastapi import HTTPException
+from pydantic import ValidationError
 
+from app.clients.local_queue import SQLiteQueueClient
+from app.clients.sqlite_store import SQLiteStore
+from app.clients.upload_store import SQLiteUploadStore
 from app.schemas import TradeAttachment, TradeIngestionRequest
+from app.services.ingestion_queue import IngestionQueueService
 from app.services.trade_ingestion import TradeIngestionService
 
 
@@ -26,6 +31,16 @@ class StubDriveClient:
             "mime_type": mime_type,
         }
 
+    async def upload_file_bytes(
+        self, *, user_id: str, file_name: str, file_bytes: bytes, mime_type: str, tags
+    ):
+        self.uploads.append((user_id, file_name, mime_type, tags))
+        return {
+            "drive_file_id": file_name,
+            "shareable_link": f"https://drive.example.com/{file_name}",
+            "mime_type": mime_type,
+        }
+
 
 class StubSheetsClient:
     async def append_trade_row(
@@ -102,3 +117,164 @@ async def test_ingestion_service_rejects_bad_mime():
             sheet_id="sheet-1",
             attachments=[attachment],
         )
+
+
+@pytest.mark.asyncio
+async def test_ingestion_service_uploads_staged_attachment(tmp_path):
+    uploads = SQLiteUploadStore(str(tmp_path / "uploads.db"))
+    staged = uploads.put(user_id="user-1", mime_type="image/png", data=b"img")
+    drive = StubDriveClient()
+    service = TradeIngestionService(drive, StubSheetsClient(), upload_store=uploads)
+    attachment = TradeAttachment(
+        filename="chart.png",
+        mime_type="image/png",
+        upload_token=staged.token,
+        content_sha256=staged.content_sha256,
+    )
+
+    response = await service.ingest_trade(
+        request=_build_request(),
+        sheet_id="sheet-1",
+        attachments=[attachment],
+    )
+
+    assert response.uploaded_files[0].drive_file_id == "chart.png"
+    assert uploads.get(staged.token, user_id="user-1") is None
+
+
+@pytest.mark.asyncio
+async def test_ingestion_service_rejects_digest_mismatch(tmp_path):
+    uploads = SQLiteUploadStore(str(tmp_path / "uploads.db"))
+    staged = uploads.put(user_id="user-1", mime_type="image/png", data=b"img")
+    service = TradeIngestionService(
+        StubDriveClient(), StubSheetsClient(), upload_store=uploads
+    )
+    attachment = TradeAttachment(
+        filename="chart.png",
+        mime_type="image/png",
+        upload_token=staged.token,
+        content_sha256="0" * 64,
+    )
+
+    with pytest.raises(HTTPException):
+        await service.ingest_trade(
+            request=_build_request(),
+            sheet_id="sheet-1",
+            attachments=[attachment],
+        )
+
+
+@pytest.mark.asyncio
+async def test_ingestion_service_rejects_staged_mime_mismatch(tmp_path):
+    uploads = SQLiteUploadStore(str(tmp_path / "uploads.db"))
+    staged = uploads.put(user_id="user-1", mime_type="image/png", data=b"img")
+    drive = StubDriveClient()
+    service = TradeIngestionService(drive, StubSheetsClient(), upload_store=uploads)
+    attachment = TradeAttachment(
+        filename="clip.mp4",
+        mime_type="video/mp4",
+        upload_token=staged.token,
+    )
+
+    with pytest.raises(HTTPException):
+        await service.ingest_trade(
+            request=_build_request(),
+            sheet_id="sheet-1",
+            attachments=[attachment],
+        )
+    assert drive.uploads == []
+
+
+def test_upload_store_prunes_expired_rows_periodically(tmp_path):
+    uploads = SQLiteUploadStore(str(tmp_path / "uploads.db"), ttl_seconds=0)
+    first = uploads.put(user_id="user-1", mime_type="image/png", data=b"a")
+    uploads.put(user_id="user-1", mime_type="image/png", data=b"b")
+
+    with uploads._connect() as conn:
+        tokens = [
+            row[0] for row in conn.execute("SELECT token FROM attachment_uploads")
+        ]
+
+    # The second put lands inside the prune interval, so the expired first row
+    # is left for a later sweep instead of being deleted on every write.
+    assert first.token in tokens
+
+
+def test_attachment_requires_exactly_one_source():
+    with pytest.raises(ValidationError):
+        TradeAttachment(filename="chart.png", mime_type="image/png")
+
+
+@pytest.mark.asyncio
+async def test_queued_ingestion_carries_upload_tokens_not_base64(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    uploads = SQLiteUploadStore(db_path)
+    queue = SQLiteQueueClient(db_path)
+    drive = StubDriveClient()
+    service = TradeIngestionService(drive, StubSheetsClient(), upload_store=uploads)
+    request = _build_request().model_copy(
+        update={"image_file_b64": base64.b64encode(b"img").decode("utf-8")}
+    )
+
+    trade, attachments = await service.stage_inline_attachments(request)
+    queue_service = IngestionQueueService(
+        queue_client=queue, store=SQLiteStore(db_path)
+    )
+    queue_service.enqueue_ingestion(
+        request=trade, sheet_id="sheet-1", attachments=attachments
+    )
+    payload = queue.receive_ingestion_requests(wait_time_seconds=0)[0]
+
+    assert payload["trade"]["image_file_b64"] is None
+    assert "file_b64" not in payload["attachments"][0]
+    queued = TradeAttachment.model_validate(payload["attachments"][0])
+    response = await service.ingest_trade(
+        request=trade, sheet_id="sheet-1", attachments=[queued]
+    )
+    assert response.uploaded_files[0].drive_file_id == "AAPL_setup.png"
+
+
+@pytest.mark.asyncio
+async def test_worker_marks_ingestion_job_completed(tmp_path):
+    from agents.trade_ingestion.worker import TradeIngestionWorker
+
+    db_path = str(tmp_path / "jobs.db")
+    store = SQLiteStore(db_path)
+    queue = SQLiteQueueClient(db_path)
+    service = TradeIngestionService(StubDriveClient(), StubSheetsClient())
+    job_id = IngestionQueueService(queue_client=queue, store=store).enqueue_ingestion(
+        request=_build_request(), sheet_id="sheet-1"
+    )
+    worker = TradeIngestionWorker(
+        queue_client=queue, store=store, ingestion_service=service
+    )
+
+    await worker.process(queue.receive_ingestion_requests(wait_time_seconds=0)[0])
+
+    record = store.get_item(partition_key="user#user-1", sort_key=f"ingestion#{job_id}")
+    assert record["status"] == "completed"
+    assert record["result"]["sheet_row_id"] == "row-42"
+
+
+@pytest.mark.asyncio
+async def test_worker_marks_malformed_ingestion_job_failed(tmp_path):
+    from agents.trade_ingestion.worker import TradeIngestionWorker
+
+    db_path = str(tmp_path / "jobs.db")
+    store = SQLiteStore(db_path)
+    queue = SQLiteQueueClient(db_path)
+    service = TradeIngestionService(StubDriveClient(), StubSheetsClient())
+    job_id = IngestionQueueService(queue_client=queue, store=store).enqueue_ingestion(
+        request=_build_request(), sheet_id="sheet-1"
+    )
+    payload = queue.receive_ingestion_requests(wait_time_seconds=0)[0]
+    payload["trade"].pop("ticker")
+    worker = TradeIngestionWorker(
+        queue_client=queue, store=store, ingestion_service=service
+    )
+
+    await worker.process(payload)
+
+    record = store.get_item(partition_key="user#user-1", sort_key=f"ingestion#{job_id}")
+    assert record["status"] == "failed"
+    assert "ticker" in record["error"]
@@ -173,3 +173,14 @@ async def test_submit_trade_endpoint_requests_more_info(overrides, client):
     assert store.get(body["session_id"]) is not None
     assert body["missing_fields"] == ["pnl", "entry_timestamp"]
     assert "profit or loss" in body["prompt"].lower()
+
+
+async def test_submit_trade_endpoint_rejects_invalid_body(overrides, client):
+    response = await client.post(
+        "/api/trades/submit",
+        params={"sheet_id": "sheet-1"},
+        json={"user_id": "user-1"},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "content"]
@@ -0,0 +1,44 @@
+try:
+    from . import _bootstrap  # noqa: F401
+except Exception:  # pragma: no cover - fallback for direct execution
+    import _bootstrap  # type: ignore # noqa: F401
+
+import asyncio
+
+from app.clients.web_search import WebSearchClient
+
+
+def test_http_client_closes_with_its_event_loop() -> None:
+    client = WebSearchClient(api_key="test-key")
+
+    async def grab_http_client():
+        return client._http()
+
+    first = asyncio.run(grab_http_client())
+    second = asyncio.run(grab_http_client())
+
+    assert first is not second
+    assert first.is_closed
+    assert second.is_closed
+
+
+def test_search_many_bounds_concurrency_and_keeps_order() -> None:
+    client = WebSearchClient(api_key="test-key")
+    active = 0
+    peak = 0
+
+    async def fake_search(query: str, *, num_results: int = 5):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        active -= 1
+        return [{"title": query}]
+
+    client.search = fake_search  # type: ignore[method-assign]
+    queries = [f"query-{index}" for index in range(5)]
+
+    results = asyncio.run(client.search_many(queries, concurrency=2))
+
+    assert [batch[0]["title"] for batch in results] == queries
+    assert peak == 2